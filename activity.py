@@ -0,0 +1,71 @@
+import asyncio
+
+
+class ActivityBuffer:
+    """Write-behind accumulator for message and reaction points.
+
+    Point deltas are summed per user and source in memory and applied in a
+    single batched write, either on a timer or once ``max_events`` events
+    have been buffered. Balances are eventually correct within one flush
+    window.
+    """
+
+    def __init__(self, engine, max_events=200):
+        self.engine = engine
+        self.max_events = max_events
+        self._pending = {}
+        self._events = 0
+        self._lock = asyncio.Lock()
+        self._flush_task = None
+
+    def _merge(self, key, username, points):
+        entry = self._pending.get(key)
+        if entry:
+            entry[0] += points
+        else:
+            self._pending[key] = [points, username]
+
+    def add(self, user_id, username, points, source):
+        """Buffer ``points`` for a user; triggers a flush when full."""
+        self._merge((user_id, source), username, points)
+        self._events += 1
+
+        if self._events >= self.max_events and (
+                self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    @property
+    def pending(self):
+        """Number of unflushed (user, source) deltas."""
+        return len(self._pending)
+
+    def _restore(self, batch):
+        # Put the deltas back so the next flush retries them
+        for key, (points, username) in batch.items():
+            self._merge(key, username, points)
+
+    async def flush(self):
+        """Write every buffered delta in one transaction.
+
+        Cancelling a flush does not cancel its write: the write is shielded
+        and still lands, and its deltas are only restored if it fails.
+        """
+        async with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            self._events = 0
+            rows = [(user_id, points, username, source)
+                    for (user_id, source), (points, username) in batch.items()]
+            write = asyncio.ensure_future(self.engine.grant_many(rows))
+            try:
+                await asyncio.shield(write)
+            except asyncio.CancelledError:
+                write.add_done_callback(
+                    lambda task: task.cancelled() or task.exception() is None
+                    or self._restore(batch))
+                raise
+            except BaseException:
+                self._restore(batch)
+                raise
+            return len(rows)
@@ -0,0 +1,37 @@
+import hashlib
+import json
+
+
+def tree_hash(tree):
+    """Stable digest of every global app command in ``tree``.
+
+    Covers names, descriptions, parameters and default permissions: the
+    same payload ``tree.sync()`` would upload.
+    """
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands()),
+                     key=lambda command: (command.get('type', 1),
+                                          command['name']))
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+async def sync_if_changed(tree, database, force=False):
+    """Sync the command tree only when its definitions changed.
+
+    The hash of the last successful sync lives in ``command_sync``.
+    Returns True if a sync was performed.
+    """
+    digest = tree_hash(tree)
+    if not force:
+        row = await database.fetchone(
+            "SELECT tree_hash FROM command_sync WHERE scope = 'global'")
+        if row and row[0] == digest:
+            return False
+
+    await tree.sync()
+    await database.execute(
+        """INSERT INTO command_sync (scope, tree_hash) VALUES ('global', ?)
+           ON CONFLICT(scope) DO UPDATE
+           SET tree_hash = excluded.tree_hash,
+               synced_at = CURRENT_TIMESTAMP""", (digest, ))
+    return True
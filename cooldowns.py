@@ -0,0 +1,63 @@
+import time
+
+
+class Cooldowns:
+    """Per-key cooldown window held in two generational buckets.
+
+    Keys are stamped into the current bucket. Once a full ``window`` has
+    passed the buckets rotate: the current one becomes the previous one and
+    the old previous bucket is dropped wholesale, since everything in it is
+    at least one window old. Memory is bounded by the keys seen in the last
+    two windows, and both the check and the expiry are O(1) amortized.
+    """
+
+    def __init__(self, window=60.0, clock=time.monotonic):
+        self.window = window
+        self.clock = clock
+        self._current = {}
+        self._previous = {}
+        self._rotated_at = clock()
+        self.evictions = 0
+        self.rotations = 0
+
+    def _rotate(self, now):
+        elapsed = now - self._rotated_at
+        if elapsed < self.window:
+            return
+        if elapsed >= 2 * self.window:
+            # Idle for two windows: both buckets have expired
+            self.evictions += len(self._previous) + len(self._current)
+            self._previous = {}
+        else:
+            self.evictions += len(self._previous)
+            self._previous = self._current
+        self._current = {}
+        self._rotated_at = now
+        self.rotations += 1
+
+    def hit(self, key):
+        """Start a cooldown for ``key`` unless one is running.
+
+        Returns True if the key was free (and is now cooling down), False
+        if it is still inside its window.
+        """
+        now = self.clock()
+        self._rotate(now)
+        stamp = self._current.get(key)
+        if stamp is None:
+            stamp = self._previous.get(key)
+        if stamp is not None and now - stamp < self.window:
+            return False
+        self._previous.pop(key, None)
+        self._current[key] = now
+        return True
+
+    def __len__(self):
+        return len(self._current) + len(self._previous)
+
+    def stats(self):
+        return {
+            'size': len(self),
+            'evictions': self.evictions,
+            'rotations': self.rotations,
+        }
@@ -0,0 +1,242 @@
+import asyncio
+import functools
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from profiler import ProfilingConnection
+
+DB_PATH = 'orders.db'
+
+# Per-connection settings; WAL itself is enabled once by migrations.migrate()
+PRAGMAS = [
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",  # ~16 MB page cache
+    "PRAGMA mmap_size=67108864",  # 64 MB memory map
+    "PRAGMA temp_store=MEMORY",
+]
+
+# Result of a single write statement
+WriteResult = namedtuple('WriteResult', ['lastrowid', 'rowcount'])
+
+
+def _execute_op(c, sql, params):
+    c.execute(sql, params)
+    return WriteResult(c.lastrowid, c.rowcount)
+
+
+def _executemany_op(c, sql, seq_of_params):
+    c.executemany(sql, seq_of_params)
+    return WriteResult(c.lastrowid, c.rowcount)
+
+
+def _resolve(future, result=None, error=None):
+    # The caller may have been cancelled after the writer picked it up
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class Database:
+    """Shared SQLite access layer.
+
+    All SQL runs off the event loop. Reads go to a small pool of reader
+    threads, each holding a long-lived connection. Writes are queued to a
+    single writer thread which coalesces everything queued at the same
+    time into one transaction (group commit) and resolves each caller's
+    future with its own result.
+    """
+
+    def __init__(self, path=DB_PATH, readers=2, max_batch=100):
+        self.path = path
+        self.max_batch = max_batch
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._reader = ThreadPoolExecutor(max_workers=readers,
+                                          thread_name_prefix='db-reader')
+
+        self._queue = queue.Queue()
+        self._stats = {
+            'batches': 0,
+            'operations': 0,
+            'failed_batches': 0,
+            'last_batch_size': 0,
+            'max_batch_size': 0,
+            'last_commit_seconds': 0.0,
+            'max_commit_seconds': 0.0,
+            'total_commit_seconds': 0.0,
+        }
+        self._writer = threading.Thread(target=self._writer_loop,
+                                        name='db-writer',
+                                        daemon=True)
+        self._writer.start()
+
+    def _connect(self, **kwargs):
+        conn = sqlite3.connect(self.path,
+                               timeout=30,
+                               check_same_thread=False,
+                               factory=ProfilingConnection,
+                               **kwargs)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    # --- Reads ---
+    def _fetchone(self, sql, params):
+        return self._connection().execute(sql, params).fetchone()
+
+    def _fetchall(self, sql, params):
+        return self._connection().execute(sql, params).fetchall()
+
+    async def _read(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._reader,
+                                          functools.partial(fn, *args))
+
+    def _call_reader(self, fn, args):
+        return fn(self._connection(), *args)
+
+    async def read(self, fn, *args):
+        """Run ``fn(connection, *args)`` on a reader thread."""
+        return await self._read(self._call_reader, fn, args)
+
+    async def fetchone(self, sql, params=()):
+        """Run a query and return its first row (or None)."""
+        return await self._read(self._fetchone, sql, params)
+
+    async def fetchall(self, sql, params=()):
+        """Run a query and return all rows."""
+        return await self._read(self._fetchall, sql, params)
+
+    # --- Writes ---
+    def _writer_loop(self):
+        # Autocommit mode: the writer issues BEGIN/COMMIT itself
+        conn = self._connect(isolation_level=None)
+        running = True
+        while running:
+            op = self._queue.get()
+            if op is None:
+                break
+            batch = [op]
+            while len(batch) < self.max_batch:
+                try:
+                    op = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if op is None:
+                    running = False
+                    break
+                batch.append(op)
+            # Callers that were cancelled while queued are dropped
+            batch = [op for op in batch
+                     if op[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._commit_batch(conn, batch)
+            except Exception as e:
+                # Never let one bad batch kill the only writer thread
+                print(f"Database writer error: {str(e)}")
+                for _, _, future in batch:
+                    _resolve(future, error=e)
+
+    def _commit_batch(self, conn, batch):
+        started = time.perf_counter()
+        results = []
+        c = conn.cursor()
+        try:
+            c.execute('BEGIN IMMEDIATE')
+            for fn, args, future in batch:
+                # Each operation gets a savepoint so one failure does not
+                # roll back the others sharing the transaction
+                c.execute('SAVEPOINT write_op')
+                try:
+                    result = fn(c, *args)
+                except Exception as e:
+                    c.execute('ROLLBACK TO write_op')
+                    c.execute('RELEASE write_op')
+                    results.append((future, None, e))
+                else:
+                    c.execute('RELEASE write_op')
+                    results.append((future, result, None))
+            c.execute('COMMIT')
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            self._stats['failed_batches'] += 1
+            for _, _, future in batch:
+                _resolve(future, error=e)
+            return
+
+        elapsed = time.perf_counter() - started
+        stats = self._stats
+        stats['batches'] += 1
+        stats['operations'] += len(batch)
+        stats['last_batch_size'] = len(batch)
+        stats['max_batch_size'] = max(stats['max_batch_size'], len(batch))
+        stats['last_commit_seconds'] = elapsed
+        stats['max_commit_seconds'] = max(stats['max_commit_seconds'],
+                                          elapsed)
+        stats['total_commit_seconds'] += elapsed
+
+        for future, result, error in results:
+            _resolve(future, result, error)
+
+    async def transaction(self, fn, *args):
+        """Queue ``fn(cursor, *args)`` for the writer thread.
+
+        ``fn`` runs inside the writer's current transaction; if it raises,
+        only its own changes are rolled back and the exception is re-raised
+        here. Whatever ``fn`` returns is handed back once committed.
+        """
+        future = Future()
+        self._queue.put((fn, args, future))
+        return await asyncio.wrap_future(future)
+
+    async def execute(self, sql, params=()):
+        """Run a single write statement."""
+        return await self.transaction(_execute_op, sql, params)
+
+    async def executemany(self, sql, seq_of_params):
+        """Run one statement for every parameter set."""
+        return await self.transaction(_executemany_op, sql,
+                                      list(seq_of_params))
+
+    def writer_metrics(self):
+        """Snapshot of write queue depth, batch sizes and commit latency."""
+        stats = dict(self._stats)
+        batches = stats['batches']
+        stats['queue_depth'] = self._queue.qsize()
+        stats['avg_batch_size'] = stats['operations'] / batches if batches else 0
+        stats['avg_commit_seconds'] = (stats['total_commit_seconds'] /
+                                       batches if batches else 0.0)
+        return stats
+
+    def close(self):
+        """Drain pending writes, stop all threads and close connections."""
+        self._queue.put(None)
+        self._writer.join()
+        self._reader.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+db = Database()
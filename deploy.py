@@ -0,0 +1,92 @@
+import asyncio
+import os
+import sys
+
+
+class GitError(Exception):
+    """A git command failed or timed out; ``output`` holds what it printed."""
+
+    def __init__(self, message, output=''):
+        super().__init__(message)
+        self.output = output
+
+
+async def git(*args, timeout=60, on_line=None):
+    """Run ``git *args`` without blocking the loop and return its output.
+
+    stdout and stderr are merged and read line by line; ``on_line`` (a
+    coroutine function) is awaited with each line as it arrives. The
+    process is killed if it runs longer than ``timeout`` seconds, or if
+    reading stops early because ``on_line`` raised or the call was
+    cancelled.
+    """
+    process = await asyncio.create_subprocess_exec(
+        'git', *args,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        env={**os.environ, 'GIT_TERMINAL_PROMPT': '0'})
+    lines = []
+
+    async def read():
+        async for raw in process.stdout:
+            line = raw.decode('utf-8', 'replace').rstrip()
+            lines.append(line)
+            if on_line is not None:
+                await on_line(line)
+        await process.wait()
+
+    try:
+        await asyncio.wait_for(read(), timeout)
+    except asyncio.TimeoutError:
+        raise GitError(f"git {args[0]} timed out after {timeout}s",
+                       "\n".join(lines))
+    finally:
+        # Timed out, cancelled, or on_line raised: don't leave git running
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    output = "\n".join(lines)
+    if process.returncode != 0:
+        raise GitError(f"git {args[0]} exited with {process.returncode}",
+                       output)
+    return output
+
+
+async def changed_files(before, after):
+    """Paths changed between two commits, relative to the repo root."""
+    output = await git('diff', '--name-only', before, after)
+    return [path for path in output.splitlines() if path]
+
+
+async def reload_changed(bot, paths):
+    """Reload the loaded extensions whose source is in ``paths``.
+
+    Returns ``(reloaded, failed, restart)``: extension names reloaded,
+    ``(name, error)`` pairs that failed (discord.py keeps the old version
+    loaded), and other changed ``.py`` files, which only take effect
+    after a restart.
+    """
+    top = (await git('rev-parse', '--show-toplevel')).strip()
+    changed = {os.path.realpath(os.path.join(top, path)) for path in paths}
+    reloaded, failed = [], []
+    covered = set()
+
+    for name in list(bot.extensions):
+        source = getattr(sys.modules.get(name), '__file__', None)
+        if not source:
+            continue
+        source = os.path.realpath(source)
+        if source not in changed:
+            continue
+        covered.add(source)
+        try:
+            await bot.reload_extension(name)
+            reloaded.append(name)
+        except Exception as e:
+            failed.append((name, e))
+
+    restart = sorted(path for path in paths if path.endswith('.py') and
+                     os.path.realpath(os.path.join(top, path)) not in covered)
+    return reloaded, failed, restart
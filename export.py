@@ -0,0 +1,79 @@
+import asyncio
+import csv
+import gzip
+import os
+import sqlite3
+import tempfile
+
+# table -> (columns, timestamp column or None, has status column)
+EXPORTS = {
+    'orders': (['order_id', 'user_id', 'username', 'item', 'quantity',
+                'status', 'timestamp'], 'timestamp', True),
+    'rewards': (['user_id', 'username', 'points', 'loyalty_tier',
+                 'last_daily'], None, False),
+    'complaints': (['complaint_id', 'user_id', 'username', 'complaint',
+                    'timestamp'], 'timestamp', False),
+    'suggestions': (['suggestion_id', 'user_id', 'username', 'suggestion',
+                     'timestamp'], 'timestamp', False),
+}
+
+
+def _query(table, start, end, status):
+    columns, time_column, has_status = EXPORTS[table]
+    where, params = [], []
+    if time_column and start:
+        where.append(f"{time_column} >= ?")
+        params.append(start)
+    if time_column and end:
+        where.append(f"{time_column} < date(?, '+1 day')")
+        params.append(end)
+    if has_status and status:
+        where.append("status = ?")
+        params.append(status)
+    clause = f" WHERE {' AND '.join(where)}" if where else ""
+    return (f"SELECT {', '.join(columns)} FROM {table}{clause} "
+            f"ORDER BY {columns[0]}"), params
+
+
+def _export(path, table, start, end, status, batch_size):
+    sql, params = _query(table, start, end, status)
+    fd, filename = tempfile.mkstemp(prefix=f'{table}-', suffix='.csv.gz')
+    os.close(fd)
+
+    # Own read-only connection: one statement reads one WAL snapshot
+    # while writers carry on
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(sql, params)
+        count = 0
+        with gzip.open(filename, 'wt', newline='', encoding='utf-8') as out:
+            writer = csv.writer(out)
+            writer.writerow(EXPORTS[table][0])
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                count += len(rows)
+        return filename, count
+    except Exception:
+        os.remove(filename)
+        raise
+    finally:
+        conn.close()
+
+
+async def export_csv(database, table, start=None, end=None, status=None,
+                     batch_size=1000):
+    """Stream ``table`` into a gzip-compressed CSV temp file.
+
+    Rows are read ``batch_size`` at a time on a worker thread and written
+    as they arrive, so memory stays flat whatever the table size. Dates
+    are inclusive ``YYYY-MM-DD`` bounds on the row timestamp; ``status``
+    only applies to orders. Returns ``(filename, row_count)``; the caller
+    deletes the file.
+    """
+    if table not in EXPORTS:
+        raise ValueError(f"unknown export table: {table}")
+    return await asyncio.to_thread(_export, database.path, table, start, end,
+                                   status, batch_size)
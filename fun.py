@@ -0,0 +1,93 @@
+import random
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+PICKUP_LINES = [
+    "Are you a donut? Because I’m totally glazed over you. 😉",
+    "If sweetness was a crime, you’d be doing life, sugar. 😘",
+    "Are you on the menu? Because I’d order you every time. 😏",
+    "Do you have a map? I keep getting lost in your eyes. 🗺️",
+    "Are you a magician? Because every time I look at you, everyone else disappears. 💫",
+    "Are you a camera? Because every time I look at you, I smile. 📷",
+    "Do you have a name? Or can I call you mine? 🤔",
+    "Are you a library? Because I can't find you in any of my books. 📚",
+    "Do you have a talent? Or can I borrow your camera lens? 📸",
+    "Are you a bank? Because I can't help you with your money. 💰",
+    "Do you have a hobby? Or can I borrow your camera lens? 📸",
+    "Are you a ghost? Because I'm feeling spooky tonight. 👻",
+    "Do you have a name? Or can I call you mine? 🤔",
+    "Are you a camera? Because every time I look at you, I smile. 📷",
+    "Do you have a name? Or can I call you mine? 🤔",
+    "Are you a library? Because I can't find you in any of my books. 📚",
+    "Do you have a talent? Or can I borrow your camera lens? 📸",
+    "Are you a bank? Because I can't help you with your money. 💰",
+    "Do you have a hobby? Or can I borrow your camera lens? 📸",
+    "Are you a ghost? Because I'm feeling spooky tonight. 👻"
+]
+
+TRUTH_QUESTIONS = [
+    "What's the sweetest thing someone has done for you? 🍯",
+    "What’s your biggest guilty pleasure? (Besides me, obviously.) 😉",
+    "What’s the most embarrassing thing you’ve ever done? 😬",
+    "What’s the most childish thing you still do? 😜",
+    "What’s the most embarrassing thing you’ve ever done in front of your crush? 😳",
+]
+
+DARE_TASKS = [
+    "Send a 💋 emoji to the last person who ordered a donut. 😘",
+    "Change your name to 'Sugar Daddy/Mommy' for 10 minutes. 🔥",
+    "Send a 🍕 emoji to the last person who ordered a pizza. 🍕",
+    "Change your name to 'Sweetie' for 10 minutes. 💖",
+    "Send a 🍦 emoji to the last person who ordered a cupcake. 🍦",
+    "Change your name to 'Sweetie' for 10 minutes. 💖",
+    "Send a 🍦 emoji to the last person who ordered a cupcake. 🍦",
+    "Change your name to 'Sweetie' for 10 minutes. 💖",
+    "Send a 🍦 emoji to the last person who ordered a cupcake. 🍦",
+]
+
+
+class Fun(commands.Cog):
+    """Flirty lines, truths and dares.
+
+    Loaded as an extension so ``/git_pull`` can reload it in place. The
+    menu panel looks the cog up on every click, so it picks up new lines
+    without a restart.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    def pickup_text(self):
+        return f"💋 **Sweet Holes Flirty Line:** {random.choice(PICKUP_LINES)}"
+
+    def truth_text(self):
+        return f"💖 **Truth:** {random.choice(TRUTH_QUESTIONS)}"
+
+    def dare_text(self):
+        return f"🔥 **Dare:** {random.choice(DARE_TASKS)}"
+
+    @app_commands.command(name="pickup",
+                          description="Get a fun, flirty pick-up line")
+    async def pickup(self, interaction: discord.Interaction):
+        """Sends a fun, flirty pick-up line."""
+        await interaction.response.send_message(self.pickup_text(),
+                                                ephemeral=True)
+
+    @app_commands.command(name="truth",
+                          description="Get a flirty truth question")
+    async def truth(self, interaction: discord.Interaction):
+        """Gives a flirty truth question."""
+        await interaction.response.send_message(self.truth_text(),
+                                                ephemeral=True)
+
+    @app_commands.command(name="dare", description="Get a fun dare task")
+    async def dare(self, interaction: discord.Interaction):
+        """Gives a fun dare task."""
+        await interaction.response.send_message(self.dare_text(),
+                                                ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(Fun(bot))
@@ -1,9 +1,12 @@
 
-from flask import Flask
+from flask import Flask, Response
 from threading import Thread
 import os, signal
 import psutil
 import logging
+from metrics import metrics
+from profiler import profiler
+from watchdog import watchdog
 
 app = Flask('')
 server = None
@@ -33,6 +36,33 @@ def home():
 def health():
     return {"status": "healthy", "timestamp": psutil.boot_time()}
 
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/queries')
+def slow_queries():
+    return {
+        "enabled": profiler.enabled,
+        "slow_ms": profiler.slow_ms,
+        "statements": [{
+            "sql": s.sql,
+            "calls": s.calls,
+            "total_ms": round(s.total * 1000, 2),
+            "max_ms": round(s.max * 1000, 2),
+            "slow": s.slow,
+            "plan": s.plan,
+        } for s in profiler.top(20)],
+    }
+
+@app.route('/loop')
+def loop_lag():
+    return {
+        "lag": watchdog.percentiles(),
+        "threshold_ms": watchdog.threshold * 1000,
+        "stalls": list(watchdog.stalls),
+    }
+
 def run():
     app.run(host='0.0.0.0', port=8080)
 
@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+
+class Leaderboard:
+    """Cached top-``size`` list plus indexed rank lookups.
+
+    The top list is one ``idx_rewards_points`` range scan, kept in memory
+    and refreshed after activity flushes or once it is ``max_age`` seconds
+    old. A user's rank is ``1 + COUNT(points > theirs)``, also answered
+    from the index rather than by sorting ``rewards``.
+    """
+
+    def __init__(self, database, size=100, page_size=10, max_age=60):
+        self.db = database
+        self.size = size
+        self.page_size = page_size
+        self.max_age = max_age
+        self._rows = []
+        self._refreshed_at = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self):
+        """Reload the top list from the database."""
+        async with self._lock:
+            self._rows = await self.db.fetchall(
+                """SELECT user_id, username, points FROM rewards
+                   WHERE points > 0
+                   ORDER BY points DESC, user_id LIMIT ?""", (self.size, ))
+            self._refreshed_at = time.monotonic()
+
+    async def page(self, number):
+        """Rows ``(rank, user_id, username, points)`` for a 1-based page.
+
+        Returns ``(rows, number, pages)`` with ``number`` clamped to the
+        available pages.
+        """
+        if (self._refreshed_at is None
+                or time.monotonic() - self._refreshed_at > self.max_age):
+            await self.refresh()
+        rows = self._rows
+        pages = max(1, -(-len(rows) // self.page_size))
+        number = min(max(number, 1), pages)
+        start = (number - 1) * self.page_size
+        return [(start + i + 1, *row)
+                for i, row in enumerate(rows[start:start + self.page_size])
+                ], number, pages
+
+    async def rank(self, user_id):
+        """``(rank, points)`` for a user, or None if they have no row."""
+        row = await self.db.fetchone(
+            """SELECT r.points,
+                      (SELECT COUNT(*) FROM rewards WHERE points > r.points) + 1
+               FROM rewards r WHERE r.user_id = ?""", (user_id, ))
+        if not row:
+            return None
+        return row[1], row[0]
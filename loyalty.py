@@ -0,0 +1,155 @@
+import asyncio
+import time
+from bisect import bisect_right
+
+
+class TierTable:
+    """Sorted thresholds from ``LOYALTY_TIERS`` for O(log n) lookups."""
+
+    def __init__(self, tiers):
+        ordered = sorted(tiers.items(), key=lambda item: item[1])
+        self.names = [name for name, _ in ordered]
+        self.thresholds = [threshold for _, threshold in ordered]
+        self._rank = {name: i for i, name in enumerate(self.names)}
+
+    def tier_for(self, points):
+        """Name of the highest tier whose threshold ``points`` reaches."""
+        return self.names[max(bisect_right(self.thresholds, points or 0) - 1,
+                              0)]
+
+    def is_promotion(self, old_tier, new_tier):
+        """True if ``new_tier`` ranks above ``old_tier``."""
+        return self._rank.get(new_tier, 0) > self._rank.get(old_tier, 0)
+
+
+class PromotionQueue:
+    """Rate-limited queue for tier promotion side effects.
+
+    Point changes only enqueue; a single worker calls
+    ``handler(user_id, old_tier, new_tier)`` at most ``per_second`` times
+    a second so role updates and announcements never run inline or burst
+    into Discord's rate limits.
+    """
+
+    def __init__(self, handler, per_second=1.0, maxsize=1000):
+        self.handler = handler
+        self.interval = 1.0 / per_second
+        self.dropped = 0
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self._task = None
+
+    def push(self, user_id, old_tier, new_tier):
+        try:
+            self._queue.put_nowait((user_id, old_tier, new_tier))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            user_id, old_tier, new_tier = await self._queue.get()
+            try:
+                await self.handler(user_id, old_tier, new_tier)
+            except Exception as e:
+                print(f"Promotion handler error: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+
+def tier_case_sql(tiers):
+    """Build a CASE expression mapping ``points`` to a tier name.
+
+    ``tiers`` maps tier name to minimum points, like ``LOYALTY_TIERS``.
+    Returns ``(sql, params)``.
+    """
+    ordered = sorted(tiers.items(), key=lambda item: item[1], reverse=True)
+    sql = "CASE"
+    params = []
+    for name, threshold in ordered[:-1]:
+        sql += " WHEN points >= ? THEN ?"
+        params += [threshold, name]
+    sql += " ELSE ? END"
+    params.append(ordered[-1][0])
+    return sql, params
+
+
+def _dirty_bounds(conn, after_user_id, low_entry, high_entry, chunk_size):
+    # Upper user_id of the next chunk of users with new ledger entries
+    row = conn.execute(
+        """SELECT MAX(user_id) FROM (
+               SELECT DISTINCT user_id FROM points_ledger
+               WHERE entry_id > ? AND entry_id <= ? AND user_id > ?
+               ORDER BY user_id LIMIT ?)""",
+        (low_entry, high_entry, after_user_id, chunk_size)).fetchone()
+    return row[0]
+
+
+def _update_chunk(c, case_sql, case_params, low_user, high_user, low_entry,
+                  high_entry):
+    rows = c.execute(
+        f"""UPDATE rewards SET loyalty_tier = {case_sql}
+            WHERE user_id > ? AND user_id <= ?
+              AND loyalty_tier IS NOT {case_sql}
+              AND user_id IN (SELECT user_id FROM points_ledger
+                              WHERE user_id > ? AND user_id <= ?
+                                AND entry_id > ? AND entry_id <= ?)
+            RETURNING user_id""",
+        (*case_params, low_user, high_user, *case_params, low_user,
+         high_user, low_entry, high_entry)).fetchall()
+    return [row[0] for row in rows]
+
+
+def _save_bookmark(c, name, value):
+    c.execute(
+        """INSERT INTO job_state (name, value) VALUES (?, ?)
+           ON CONFLICT(name) DO UPDATE SET value = excluded.value""",
+        (name, value))
+
+
+async def recompute_tiers(database, tiers, cache=None, chunk_size=500):
+    """Recompute ``loyalty_tier`` for users whose points changed.
+
+    Users are found through ledger entries newer than the last run's
+    bookmark and updated with one set-based UPDATE per chunk of
+    ``chunk_size`` users, so the write lock is only held briefly. Only
+    rows whose tier actually changes are written.
+
+    Returns ``(changed_user_ids, chunk_seconds)``.
+    """
+    row = await database.fetchone(
+        "SELECT value FROM job_state WHERE name = 'loyalty_ledger_entry'")
+    low_entry = row[0] if row else 0
+    high_entry = (await database.fetchone(
+        "SELECT COALESCE(MAX(entry_id), 0) FROM points_ledger"))[0]
+    if high_entry <= low_entry:
+        return [], []
+
+    case_sql, case_params = tier_case_sql(tiers)
+    changed = []
+    timings = []
+    low_user = -1
+    while True:
+        high_user = await database.read(_dirty_bounds, low_user, low_entry,
+                                        high_entry, chunk_size)
+        if high_user is None:
+            break
+        started = time.perf_counter()
+        changed += await database.transaction(_update_chunk, case_sql,
+                                              case_params, low_user,
+                                              high_user, low_entry,
+                                              high_entry)
+        timings.append(time.perf_counter() - started)
+        low_user = high_user
+
+    await database.transaction(_save_bookmark, 'loyalty_ledger_entry',
+                               high_entry)
+    if cache is not None:
+        for user_id in changed:
+            cache.invalidate(user_id)
+    return changed, timings
@@ -5,81 +5,170 @@ from discord.errors import LoginFailure, PrivilegedIntentsRequired
 import sqlite3
 import os
 import asyncio
+import itertools
 import random
 from datetime import datetime, timedelta
+from typing import Literal
+
+from activity import ActivityBuffer
+from command_sync import sync_if_changed
+from cooldowns import Cooldowns
+from database import DB_PATH, db
+from deploy import GitError, changed_files, git, reload_changed
+from export import export_csv
+from leaderboard import Leaderboard
+from loyalty import PromotionQueue, TierTable, recompute_tiers
+from member_index import MemberIndex
+from metrics import instrument_commands, instrument_ui
+from migrations import migrate
+from outbox import Outbox
+from pagination import KeysetQuery
+from panels import PanelRegistry
+import points as ledger
+from points import PointsEngine
+from profiler import profiler
+from reports import daily_totals
+from reward_cache import RewardCache
+from startup import Startup
+from vendor_catalog import VendorCatalog
+from watchdog import watchdog
+
+
+# Database Setup & Migrations
+migrate(DB_PATH)  # Ensures the schema is current before the bot starts
+
+# Loyalty Tiers & Perks
+LOYALTY_TIERS = {
+    "Flirty Bronze": 0,
+    "Sweet Silver": 500,
+    "Seductive Gold": 1000
+}
+
+# Tier promotions: optional role per tier and an announcement channel
+TIER_ROLE_NAMES = {}  # e.g. {"Sweet Silver": "Sweet Silver"}
+PROMOTION_CHANNEL_ID = 1337646191994867772  # VIP channel; None to disable
+tier_table = TierTable(LOYALTY_TIERS)
 
 
-# Database Setup & Auto Creation
-def setup_database():
-    conn = sqlite3.connect('orders.db')
-    c = conn.cursor()
+async def announce_promotion(user_id, old_tier, new_tier):
+    """Assigns the new tier role and announces the promotion."""
+    channel = bot.get_channel(PROMOTION_CHANNEL_ID) if PROMOTION_CHANNEL_ID else None
+    if not channel:
+        return
+
+    member = channel.guild.get_member(user_id)
+    role_name = TIER_ROLE_NAMES.get(new_tier)
+    if member and role_name:
+        role = discord.utils.get(channel.guild.roles, name=role_name)
+        if role:
+            await member.add_roles(role)
 
+    embed = discord.Embed(
+        title="🏅 Tier Promotion!",
+        description=f"<@{user_id}> just moved up from {old_tier} to **{new_tier}**! 🎉",
+        color=discord.Color.gold())
+    await channel.send(embed=embed)
+
+
+promotion_queue = PromotionQueue(announce_promotion, per_second=1.0)
+
+# Activity points are buffered and written in batches
+ACTIVITY_FLUSH_SECONDS = 10
+ACTIVITY_FLUSH_EVENTS = 200
+# Cached reward rows for tier/redeem lookups
+reward_cache = RewardCache(db)
+vendor_catalog = VendorCatalog(db)
+points_engine = PointsEngine(db,
+                             cache=reward_cache,
+                             tiers=tier_table,
+                             on_promotion=promotion_queue.push)
+activity_buffer = ActivityBuffer(points_engine,
+                                 max_events=ACTIVITY_FLUSH_EVENTS)
+panel_registry = PanelRegistry(db)
+leaderboard = Leaderboard(db, size=100, page_size=10)
+startup = Startup(concurrency=3)
+
+
+@tasks.loop(seconds=ACTIVITY_FLUSH_SECONDS)
+async def flush_activity():
+    """Writes buffered activity points to the database."""
     try:
-        c.execute('BEGIN TRANSACTION')
-
-        # Create rewards table first
-        c.execute('''CREATE TABLE IF NOT EXISTS rewards
-                     (user_id INTEGER PRIMARY KEY,
-                      points INTEGER DEFAULT 0,
-                      loyalty_tier TEXT DEFAULT 'Flirty Bronze',
-                      last_daily TIMESTAMP,
-                      username TEXT)''')
-
-        # Create git push tracking table
-        c.execute('''CREATE TABLE IF NOT EXISTS git_pushes
-                     (push_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                      commit_hash TEXT,
-                      commit_message TEXT,
-                      status TEXT)''')
-
-        # Create tables if they don't exist
-        c.execute('''CREATE TABLE IF NOT EXISTS orders 
-                     (order_id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, username TEXT, item TEXT, quantity INTEGER, status TEXT, 
-                      timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-
-        c.execute('''CREATE TABLE IF NOT EXISTS rewards 
-                     (user_id INTEGER PRIMARY KEY, 
-                      username TEXT NOT NULL,
-                      points INTEGER DEFAULT 0,
-                      loyalty_tier TEXT DEFAULT 'Flirty Bronze', 
-                      last_daily TIMESTAMP)''')
-
-        c.execute('''CREATE TABLE IF NOT EXISTS feedback 
-                     (feedback_id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, username TEXT, rating INTEGER, comment TEXT)'''
-                  )
-
-        c.execute('''CREATE TABLE IF NOT EXISTS complaints
-                     (complaint_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      user_id INTEGER, username TEXT, complaint TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)'''
-                  )
-
-        c.execute('''CREATE TABLE IF NOT EXISTS suggestions
-                     (suggestion_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      user_id INTEGER, username TEXT, suggestion TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)'''
-                  )
-
-        c.execute('''CREATE TABLE IF NOT EXISTS vendor_rewards
-                     (reward_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      vendor_id INTEGER, vendor_username TEXT, reward_name TEXT, 
-                      points_cost INTEGER, description TEXT)'''
-                  )
-
-        c.execute('COMMIT')
+        if await activity_buffer.flush():
+            await leaderboard.refresh()
     except Exception as e:
-        c.execute('ROLLBACK')
-        print(f"Database setup error: {str(e)}")
-    finally:
-        conn.close()
+        print(f"Activity flush error: {str(e)}")
 
 
-setup_database()  # Ensures tables exist before the bot starts
+@tasks.loop(hours=24)
+async def reconcile_ledger():
+    """Verifies every reward balance against its ledger entries."""
+    try:
+        mismatches = await points_engine.reconcile()
+        for user_id, balance, ledger_sum in mismatches:
+            print(f"⚠️ Ledger mismatch for {user_id}: balance {balance}, "
+                  f"ledger {ledger_sum}")
+        print(f"✅ Ledger reconciled ({len(mismatches)} mismatches)")
+    except Exception as e:
+        print(f"Ledger reconciliation error: {str(e)}")
+
+
+# Reloadable in place by /git_pull; everything else needs a restart
+EXTENSIONS = ['fun']
+
+
+class SweetHolesBot(commands.Bot):
+
+    async def setup_hook(self):
+        for extension in EXTENSIONS:
+            await self.load_extension(extension)
+
+        # Latency/error metrics for every command, button and modal
+        instrument_commands(self.tree)
+        instrument_ui()
+        watchdog.start()  # Loop lag samples and blocking-call stacks
+
+        # Panel buttons keep working across restarts without reposting
+        for view in (MenuView(), OrderView(), TierView(), VIPView(),
+                     JobView(), RedeemPanelView(), VendorPanelView(),
+                     ComplaintView(), SuggestionView()):
+            self.add_view(view)
+
+        flush_activity.start()
+        reconcile_ledger.start()
+        update_loyalty.start()
+        promotion_queue.start()
+        outbox.start()
+
+    async def close(self):
+        # Make sure no buffered points are lost on shutdown: a flush already
+        # running finishes, and the final flush below waits for its lock
+        flush_activity.stop()
+        reconcile_ledger.cancel()
+        update_loyalty.cancel()
+        promotion_queue.stop()
+        outbox.stop()
+        watchdog.stop()
+        try:
+            await activity_buffer.flush()
+        except Exception as e:
+            print(f"Activity flush error: {str(e)}")
+        await super().close()
+
 
 # Bot Setup
 intents = discord.Intents.default()
 intents.members = True
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = SweetHolesBot(command_prefix="!", intents=intents)
+
+# Staff and channel notifications are queued and sent in the background
+outbox = Outbox(db, bot, per_channel_seconds=1.0)
+# Orders and redemptions arrive in bursts; send them to staff as digests
+DIGEST_WINDOW_SECONDS = 10
+DIGEST_THRESHOLD = 3  # more than this many in one window become a digest
+outbox.coalesce(1337712800453230643,
+                window=DIGEST_WINDOW_SECONDS,
+                threshold=DIGEST_THRESHOLD)
 
 # Admin role name
 ADMIN_ROLE_NAME = "Sweet Holes Admin"
@@ -94,18 +183,15 @@ def is_admin():
     return commands.check(predicate)
 
 
+def is_app_admin():
+    """Admin check for slash commands, which ignore ``commands.check``."""
+    return discord.app_commands.checks.has_any_role(ADMIN_ROLE_NAME, "Owner")
+
+
 # Brand Assets
 MAIN_LOGO_URL = "https://yourhost.com/main-logo.png"
 FOOTER_IMAGE_URL = "https://yourhost.com/footer.png"
 
-# Loyalty Tiers & Perks
-LOYALTY_TIERS = {
-    "Flirty Bronze": 0,
-    "Sweet Silver": 500,
-    "Seductive Gold": 1000
-}
-
-
 class ApplicationModal(discord.ui.Modal,
                        title="💖 Sweet Holes VIP Application"):
 
@@ -116,38 +202,24 @@ class ApplicationModal(discord.ui.Modal,
     async def on_submit(self, interaction: discord.Interaction):
         try:
             # Add user to rewards program first
-            conn = sqlite3.connect('orders.db')
-            c = conn.cursor()
-
-            # Check if user already exists in rewards
-            c.execute("SELECT user_id FROM rewards WHERE user_id = ?", (interaction.user.id,))
-            existing_user = c.fetchone()
-
-            if not existing_user:
-                c.execute(
-                    "INSERT INTO rewards (user_id, points, loyalty_tier, username) VALUES (?, ?, ?, ?)",
-                    (interaction.user.id, 50, "Flirty Bronze", interaction.user.display_name))
-                conn.commit()
-
-            conn.close()
+            await points_engine.enroll(interaction.user.id, 50,
+                                       interaction.user.display_name)
 
             # Assign VIP role
             vip_role = interaction.guild.get_role(1337508682417700961)
             if vip_role:
                 await interaction.user.add_roles(vip_role)
 
-                # Send notification to VIP channel
-                vip_channel = interaction.client.get_channel(1337646191994867772)
-                if vip_channel:
-                    welcome_embed = discord.Embed(
-                        title="🎉 New VIP Member!",
-                        description=f"Welcome {interaction.user.mention} to Sweet Holes VIP!",
-                        color=discord.Color.gold())
-                    await vip_channel.send(embed=welcome_embed)
-
                 await interaction.response.send_message(
                     "✅ Welcome to Sweet Holes VIP! Your application has been processed and role assigned! 🎉",
                     ephemeral=True)
+
+                # Queue notification to VIP channel after replying
+                welcome_embed = discord.Embed(
+                    title="🎉 New VIP Member!",
+                    description=f"Welcome {interaction.user.mention} to Sweet Holes VIP!",
+                    color=discord.Color.gold())
+                await outbox.enqueue(1337646191994867772, welcome_embed)
             else:
                 await interaction.response.send_message(
                     "❌ There was an issue assigning the VIP role. Please contact an admin.",
@@ -160,52 +232,22 @@ class ApplicationModal(discord.ui.Modal,
                 ephemeral=True)
 
 
-# Fun Responses
-PICKUP_LINES = [
-    "Are you a donut? Because I’m totally glazed over you. 😉",
-    "If sweetness was a crime, you’d be doing life, sugar. 😘",
-    "Are you on the menu? Because I’d order you every time. 😏",
-    "Do you have a map? I keep getting lost in your eyes. 🗺️",
-    "Are you a magician? Because every time I look at you, everyone else disappears. 💫",
-    "Are you a camera? Because every time I look at you, I smile. 📷",
-    "Do you have a name? Or can I call you mine? 🤔",
-    "Are you a library? Because I can't find you in any of my books. 📚",
-    "Do you have a talent? Or can I borrow your camera lens? 📸",
-    "Are you a bank? Because I can't help you with your money. 💰",
-    "Do you have a hobby? Or can I borrow your camera lens? 📸",
-    "Are you a ghost? Because I'm feeling spooky tonight. 👻",
-    "Do you have a name? Or can I call you mine? 🤔",
-    "Are you a camera? Because every time I look at you, I smile. 📷",
-    "Do you have a name? Or can I call you mine? 🤔",
-    "Are you a library? Because I can't find you in any of my books. 📚",
-    "Do you have a talent? Or can I borrow your camera lens? 📸",
-    "Are you a bank? Because I can't help you with your money. 💰",
-    "Do you have a hobby? Or can I borrow your camera lens? 📸",
-    "Are you a ghost? Because I'm feeling spooky tonight. 👻"
-]
-
-TRUTH_QUESTIONS = [
-    "What's the sweetest thing someone has done for you? 🍯",
-    "What’s your biggest guilty pleasure? (Besides me, obviously.) 😉",
-    "What’s the most embarrassing thing you’ve ever done? 😬",
-    "What’s the most childish thing you still do? 😜",
-    "What’s the most embarrassing thing you’ve ever done in front of your crush? 😳",
-]
-
-DARE_TASKS = [
-    "Send a 💋 emoji to the last person who ordered a donut. 😘",
-    "Change your name to 'Sugar Daddy/Mommy' for 10 minutes. 🔥",
-    "Send a 🍕 emoji to the last person who ordered a pizza. 🍕",
-    "Change your name to 'Sweetie' for 10 minutes. 💖",
-    "Send a 🍦 emoji to the last person who ordered a cupcake. 🍦",
-    "Change your name to 'Sweetie' for 10 minutes. 💖",
-    "Send a 🍦 emoji to the last person who ordered a cupcake. 🍦",
-    "Change your name to 'Sweetie' for 10 minutes. 💖",
-    "Send a 🍦 emoji to the last person who ordered a cupcake. 🍦",
-]
+# --- Order System ---
+def _place_order(c, user, order_text):
+    # The staff notification is stored in the same transaction as the order
+    c.execute(
+        "INSERT INTO orders (user_id, item, quantity, status, username) VALUES (?, ?, ?, ?, ?)",
+        (user.id, order_text, 1, 'Pending', user.display_name))
+    order_id = c.lastrowid
+    staff_embed = discord.Embed(
+        title="🔔 New Order!",
+        description=
+        f"**Order ID:** `{order_id}`\n**Customer:** {user.mention}\n🍩 **Order:** {order_text}",
+        color=discord.Color.green())
+    outbox.add(c, 1337712800453230643, staff_embed)
+    return order_id
 
 
-# --- Order System ---
 class OrderView(View):
 
     def __init__(self):
@@ -221,14 +263,10 @@ class OrderView(View):
         async def on_submit(self, interaction: discord.Interaction):
             try:
                 order_text = self.order_input.value
-                conn = sqlite3.connect('orders.db')
-                c = conn.cursor()
-                c.execute(
-                    "INSERT INTO orders (user_id, item, quantity, status, username) VALUES (?, ?, ?, ?, ?)",
-                    (interaction.user.id, order_text, 1, 'Pending', interaction.user.display_name))
-                conn.commit()
-                order_id = c.lastrowid
-                conn.close()
+                order_id = await db.transaction(_place_order,
+                                                interaction.user,
+                                                order_text)
+                outbox.wake()
 
                 # Send confirmation to user
                 embed = discord.Embed(
@@ -238,40 +276,28 @@ class OrderView(View):
                     color=discord.Color.pink())
                 await interaction.response.send_message(embed=embed,
                                                         ephemeral=True)
-
-                # Send notification to staff channel
-                staff_channel = interaction.client.get_channel(
-                    1337712800453230643)
-                if staff_channel:
-                    staff_embed = discord.Embed(
-                        title="🔔 New Order!",
-                        description=
-                        f"**Order ID:** `{order_id}`\n**Customer:** {interaction.user.mention}\n🍩 **Order:** {order_text}",
-                        color=discord.Color.green())
-                    await staff_channel.send(embed=staff_embed)
             except Exception as e:
                 print(f"Order Error: {str(e)}")
                 await interaction.response.send_message(
                     "❌ Oops! Something went wrong with your order. Please try again!",
                     ephemeral=True)
 
-    @discord.ui.button(label="🍩 Place Order", style=discord.ButtonStyle.green)
+    @discord.ui.button(label="🍩 Place Order",
+                       style=discord.ButtonStyle.green,
+                       custom_id="order_place")
     async def place_order(self, interaction: discord.Interaction,
                           button: Button):
         await interaction.response.send_modal(self.OrderModal())
 
     @discord.ui.button(label="📦 Check Status",
-                       style=discord.ButtonStyle.blurple)
+                       style=discord.ButtonStyle.blurple,
+                       custom_id="order_status")
     async def check_status(self, interaction: discord.Interaction,
                            button: Button):
         user_id = interaction.user.id
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
-        c.execute(
+        orders = await db.fetchall(
             "SELECT order_id, item, quantity, status FROM orders WHERE user_id = ? ORDER BY order_id DESC LIMIT 5",
             (user_id, ))
-        orders = c.fetchall()
-        conn.close()
 
         if not orders:
             await interaction.response.send_message(
@@ -289,7 +315,9 @@ class OrderView(View):
                 inline=False)
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
-    @discord.ui.button(label="❌ Cancel Order", style=discord.ButtonStyle.red)
+    @discord.ui.button(label="❌ Cancel Order",
+                       style=discord.ButtonStyle.red,
+                       custom_id="order_cancel")
     async def cancel_order(self, interaction: discord.Interaction,
                            button: Button):
 
@@ -301,19 +329,15 @@ class OrderView(View):
             async def on_submit(self, interaction: discord.Interaction):
                 try:
                     order_id = int(self.order_id.value)
-                    conn = sqlite3.connect('orders.db')
-                    c = conn.cursor()
-                    c.execute(
+                    order = await db.fetchone(
                         "SELECT status FROM orders WHERE order_id = ? AND user_id = ?",
                         (order_id, interaction.user.id))
-                    order = c.fetchone()
 
                     if order:
                         if order[0] == 'Pending':
-                            c.execute(
+                            await db.execute(
                                 "DELETE FROM orders WHERE order_id = ? AND user_id = ?",
                                 (order_id, interaction.user.id))
-                            conn.commit()
                             await interaction.response.send_message(
                                 f"💝 Order #{order_id} cancelled, darling!",
                                 ephemeral=True)
@@ -325,7 +349,6 @@ class OrderView(View):
                         await interaction.response.send_message(
                             "❌ Order not found or not yours to cancel, sweetie!",
                             ephemeral=True)
-                    conn.close()
                 except ValueError:
                     await interaction.response.send_message(
                         "❌ Please enter a valid order number, sugar!",
@@ -337,34 +360,54 @@ class OrderView(View):
 class MenuView(View):
 
     def __init__(self):
-        super().__init__()
+        super().__init__(timeout=None)  # Make the view persistent
 
-    @discord.ui.button(label="💋 Flirt", style=discord.ButtonStyle.danger)
+    @discord.ui.button(label="💋 Flirt",
+                       style=discord.ButtonStyle.danger,
+                       custom_id="menu_flirt")
     async def flirt(self, interaction: discord.Interaction, button: Button):
-        line = random.choice(PICKUP_LINES)
-        await interaction.response.send_message(
-            f"💋 **Sweet Holes Flirty Line:** {line}", ephemeral=True)
+        await send_fun_text(interaction, 'pickup_text')
 
-    @discord.ui.button(label="💖 Truth", style=discord.ButtonStyle.primary)
+    @discord.ui.button(label="💖 Truth",
+                       style=discord.ButtonStyle.primary,
+                       custom_id="menu_truth")
     async def truth_button(self, interaction: discord.Interaction,
                            button: Button):
-        question = random.choice(TRUTH_QUESTIONS)
-        await interaction.response.send_message(f"💖 **Truth:** {question}",
-                                                ephemeral=True)
+        await send_fun_text(interaction, 'truth_text')
 
-    @discord.ui.button(label="🔥 Dare", style=discord.ButtonStyle.danger)
+    @discord.ui.button(label="🔥 Dare",
+                       style=discord.ButtonStyle.danger,
+                       custom_id="menu_dare")
     async def dare_button(self, interaction: discord.Interaction,
                           button: Button):
-        dare = random.choice(DARE_TASKS)
-        await interaction.response.send_message(f"🔥 **Dare:** {dare}",
-                                                ephemeral=True)
+        await send_fun_text(interaction, 'dare_text')
+
+
+async def send_fun_text(interaction, name):
+    """Replies with a line from the Fun cog, looked up on every click."""
+    fun = interaction.client.get_cog('Fun')
+    if fun is None:  # extension failed to load or is mid-reload
+        await interaction.response.send_message(
+            "❌ The fun features are unavailable right now. Please try again later.",
+            ephemeral=True)
+        return
+    await interaction.response.send_message(getattr(fun, name)(),
+                                            ephemeral=True)
 
 
 # --- Loyalty System ---
 @tasks.loop(hours=24)
 async def update_loyalty():
     """Upgrades users based on points."""
-    conn = sqlite3.connect('orders.db')
+    try:
+        changed, timings = await recompute_tiers(db,
+                                                 LOYALTY_TIERS,
+                                                 cache=reward_cache)
+        chunk_ms = ", ".join(f"{t * 1000:.1f}" for t in timings)
+        print(f"✅ Loyalty update: {len(changed)} tier changes "
+              f"in {len(timings)} chunks ({chunk_ms} ms)")
+    except Exception as e:
+        print(f"Loyalty update error: {str(e)}")
 
 
 class SuggestionView(discord.ui.View):
@@ -392,14 +435,185 @@ class ComplaintView(View):
         super().__init__(timeout=None)  # Make the view persistent
 
     @discord.ui.button(label="📝 File Complaint",
-                       style=discord.ButtonStyle.danger)
+                       style=discord.ButtonStyle.danger,
+                       custom_id="complaint_file")
     async def file_complaint(self, interaction: discord.Interaction,
                              button: Button):
         modal = ComplaintModal()
         await interaction.response.send_modal(modal)
 
 
-# Menu and order commands are now handled in on_ready
+class TierView(View):
+
+    def __init__(self):
+        super().__init__(timeout=None)  # Make the view persistent
+
+    @discord.ui.button(label="💝 Check My Tier",
+                       style=discord.ButtonStyle.blurple,
+                       custom_id="tier_check")
+    async def check_tier(self, interaction: discord.Interaction,
+                         button: Button):
+        if interaction.channel_id != 1337508683684384846:
+            await interaction.response.send_message(
+                "❌ This command can only be used in the check tier channel!",
+                ephemeral=True)
+            return
+
+        result = await reward_cache.get(interaction.user.id)
+        points, tier = result if result else (0, "Flirty Bronze")
+        embed = discord.Embed(
+            title="💖 Your VIP Sweet Holes Card 💖",
+            description=
+            f"👤 **{interaction.user.display_name}**\n🏅 **Tier:** {tier}\n🎁 **Points:** {points}",
+            color=discord.Color.pink())
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+class VIPView(View):
+
+    def __init__(self):
+        super().__init__(timeout=None)  # Make the view persistent
+
+    @discord.ui.button(label="🌟 Apply for VIP",
+                       style=discord.ButtonStyle.danger,
+                       custom_id="vip_apply")
+    async def apply(self, interaction: discord.Interaction, button: Button):
+        if interaction.channel_id != 1337508682950377480:
+            await interaction.response.send_message("❌ Wrong channel!",
+                                                    ephemeral=True)
+            return
+        response_channel = interaction.client.get_channel(1337645313279791174)
+        await interaction.response.send_modal(
+            ApplicationModal(response_channel))
+
+
+class JobView(View):
+
+    def __init__(self):
+        super().__init__(timeout=None)  # Make the view persistent
+
+    @discord.ui.button(label="📝 Apply Now",
+                       style=discord.ButtonStyle.primary,
+                       custom_id="job_apply")
+    async def apply(self, interaction: discord.Interaction, button: Button):
+        if interaction.channel_id != 1337508683286052894:
+            await interaction.response.send_message("❌ Wrong channel!",
+                                                    ephemeral=True)
+            return
+        response_channel = interaction.client.get_channel(1337645313279791174)
+        await interaction.response.send_modal(
+            ApplicationModal(response_channel))
+
+
+class RedeemPanelView(View):
+
+    def __init__(self):
+        super().__init__(timeout=None)  # Make the view persistent
+
+    @discord.ui.button(label="🎁 Redeem Points",
+                       style=discord.ButtonStyle.success,
+                       custom_id="redeem_open")
+    async def redeem(self, interaction: discord.Interaction, button: Button):
+        if interaction.channel_id != 1337508683684384847:
+            await interaction.response.send_message("❌ Wrong channel!",
+                                                    ephemeral=True)
+            return
+
+        result = await reward_cache.get(interaction.user.id)
+        points = result[0] if result else 0
+        embed = discord.Embed(
+            title="🎁 Sweet Holes Rewards Redemption",
+            description=
+            f"You have **{points}** points available!\nChoose a reward to redeem:",
+            color=discord.Color.gold())
+        await interaction.response.send_message(embed=embed,
+                                                view=RedeemView(points),
+                                                ephemeral=True)
+
+
+class VendorPanelView(View):
+
+    def __init__(self):
+        super().__init__(timeout=None)  # Make the view persistent
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.channel_id != 1337705856061407283:
+            await interaction.response.send_message("❌ Wrong channel!",
+                                                    ephemeral=True)
+            return False
+        if not any(role.name == "Partner" for role in interaction.user.roles):
+            await interaction.response.send_message(
+                "❌ You need the Partner role to use this!", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="➕ Add Reward",
+                       style=discord.ButtonStyle.primary,
+                       custom_id="vendor_add")
+    async def add_reward(self, interaction: discord.Interaction,
+                         button: Button):
+        await interaction.response.send_modal(VendorRewardModal())
+
+    @discord.ui.button(label="🗑️ Remove Reward",
+                       style=discord.ButtonStyle.danger,
+                       custom_id="vendor_remove")
+    async def remove_reward(self, interaction: discord.Interaction,
+                            button: Button):
+        await interaction.response.send_modal(RemoveVendorRewardModal())
+
+
+def channel_panels():
+    """(key, channel_id, embed, view) for every panel the bot maintains."""
+    return [
+        ('menu', 1337692528509456414,
+         discord.Embed(title="🎀 Sweet Holes Interactive Menu 🎀",
+                       description="Click the buttons below to interact!",
+                       color=discord.Color.pink()), MenuView()),
+        ('order', 1337508683286052899,
+         discord.Embed(title="🍩 Sweet Holes Order System 🍩",
+                       description="What can we get for you today, sugar? 😘",
+                       color=discord.Color.pink()), OrderView()),
+        ('tier', 1337508683684384846,
+         discord.Embed(
+             title="💖 Check Your VIP Status 💖",
+             description="Click the button below to check your tier and points!",
+             color=discord.Color.pink()), TierView()),
+        ('vip', 1337508682950377480,
+         discord.Embed(
+             title="💎 SWEET HOLES VIP MEMBERSHIP 💎",
+             description="Join our exclusive VIP program and unlock special perks!",
+             color=discord.Color.gold()), VIPView()),
+        ('job', 1337508683286052894,
+         discord.Embed(title="💼 SWEET HOLES EMPLOYMENT 💼",
+                       description="Join our amazing team! Click below to apply.",
+                       color=discord.Color.blue()), JobView()),
+        ('redeem', 1337508683684384847,
+         discord.Embed(title="🎁 Sweet Holes Rewards Redemption",
+                       description="Click below to redeem your reward points!",
+                       color=discord.Color.gold()), RedeemPanelView()),
+        ('vendor', 1337705856061407283,
+         discord.Embed(
+             title="🏪 Vendor Reward Management",
+             description="Click below to add or manage your vendor rewards!",
+             color=discord.Color.blue()), VendorPanelView()),
+        ('complaints', 1337644894558097408,
+         discord.Embed(title="📝 File a Complaint",
+                       description="Having an issue? Let us know below.",
+                       color=discord.Color.red()), ComplaintView()),
+        ('suggestions', 1337508683286052895,
+         discord.Embed(
+             title="💡 Make a Suggestion",
+             description=
+             "Have an idea to make Sweet Holes even better? Share it with us!",
+             color=discord.Color.green()), SuggestionView()),
+    ]
+
+
+async def publish_panel(key, channel, embed, view):
+    """Posts a missing panel or edits a changed one; otherwise does nothing."""
+    status = await panel_registry.publish(key, channel, embed, view)
+    if status != 'unchanged':
+        print(f"✅ Panel {key} {status}")
 
 
 @bot.tree.command(name="my_tier", description="Check your loyalty tier")
@@ -411,14 +625,9 @@ async def my_tier(interaction: discord.Interaction):
         return
     """Check your loyalty tier."""
     user_id = interaction.user.id
-    conn = sqlite3.connect('orders.db')
-    c = conn.cursor()
-    c.execute("SELECT loyalty_tier, points FROM rewards WHERE user_id = ?",
-              (user_id, ))
-    result = c.fetchone()
-    conn.close()
+    result = await reward_cache.get(user_id)
 
-    tier, points = result if result else ("Flirty Bronze", 0)
+    points, tier = result if result else (0, "Flirty Bronze")
 
     embed = discord.Embed(
         title="💖 Your VIP Sweet Holes Card 💖",
@@ -432,29 +641,38 @@ async def my_tier(interaction: discord.Interaction):
     await interaction.response.send_message(embed=embed)
 
 
-# --- Fun Features ---
-@bot.tree.command(name="pickup", description="Get a fun, flirty pick-up line")
-async def pickup(interaction: discord.Interaction):
-    """Sends a fun, flirty pick-up line."""
-    line = random.choice(PICKUP_LINES)
-    await interaction.response.send_message(
-        f"💋 **Sweet Holes Flirty Line:** {line}", ephemeral=True)
+@bot.tree.command(name="leaderboard", description="See the top point earners")
+async def show_leaderboard(interaction: discord.Interaction, page: int = 1):
+    rows, page, pages = await leaderboard.page(page)
 
+    embed = discord.Embed(title="🏆 Sweet Holes Leaderboard",
+                          color=discord.Color.gold())
+    if not rows:
+        embed.description = "No points earned yet, be the first! 😘"
+    else:
+        medals = {1: "🥇", 2: "🥈", 3: "🥉"}
+        embed.description = "\n".join(
+            f"{medals.get(rank, f'#{rank}')} **{username or 'Unknown'}** ({points} points)"
+            for rank, _, username, points in rows)
+    embed.set_footer(text=f"Page {page}/{pages}")
+    await interaction.response.send_message(embed=embed)
 
-@bot.tree.command(name="truth", description="Get a flirty truth question")
-async def truth(interaction: discord.Interaction):
-    """Gives a flirty truth question."""
-    question = random.choice(TRUTH_QUESTIONS)
-    await interaction.response.send_message(f"💖 **Truth:** {question}",
-                                            ephemeral=True)
 
+@bot.tree.command(name="rank", description="Check your leaderboard rank")
+async def rank(interaction: discord.Interaction,
+               member: discord.Member = None):
+    member = member or interaction.user
+    result = await leaderboard.rank(member.id)
+    if not result:
+        await interaction.response.send_message(
+            f"💔 {member.display_name} hasn't earned any points yet!",
+            ephemeral=True)
+        return
 
-@bot.tree.command(name="dare", description="Get a fun dare task")
-async def dare(interaction: discord.Interaction):
-    """Gives a fun dare task."""
-    dare = random.choice(DARE_TASKS)
-    await interaction.response.send_message(f"🔥 **Dare:** {dare}",
-                                            ephemeral=True)
+    position, points = result
+    await interaction.response.send_message(
+        f"🏅 **{member.display_name}** is ranked **#{position}** with {points} points!",
+        ephemeral=True)
 
 
 @bot.tree.command(name="daily", description="Claim your daily bonus points")
@@ -464,87 +682,69 @@ async def daily(interaction: discord.Interaction):
         user_id = interaction.user.id
         await interaction.response.defer(ephemeral=True)
 
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
+        result = await db.fetchone(
+            "SELECT last_daily, points FROM rewards WHERE user_id = ?",
+            (user_id, ))
+        current_time = datetime.now()
+
+        if not result:
+            # New user welcome bonus with animation
+            bonus_points = random.randint(1, 40)
+            await points_engine.grant(
+                user_id,
+                bonus_points,
+                ledger.SOURCE_WELCOME_BONUS,
+                username=interaction.user.name,
+                last_daily=current_time.strftime('%Y-%m-%d %H:%M:%S'))
+
+            reward_msg = await interaction.followup.send(
+                "🎲 **Rolling your welcome bonus**... \n╰⊱⭑⭑⭑⊱╮",
+                ephemeral=True)
+            await asyncio.sleep(1.5)
+            await reward_msg.edit(content=f"🎉 **WELCOME BONUS!** 🎊\n"
+                                  f"You won **+{bonus_points} points!**\n"
+                                  f"╰⊱{'⭐' * (bonus_points // 8 + 1)}⊱╮")
 
-        try:
-            c.execute('''CREATE TABLE IF NOT EXISTS rewards
-                        (user_id INTEGER PRIMARY KEY, points INTEGER DEFAULT 0,
-                         loyalty_tier TEXT DEFAULT 'Flirty Bronze',
-                         last_daily TIMESTAMP, username TEXT)''')
-            conn.commit()
-
-            c.execute(
-                "SELECT last_daily, points FROM rewards WHERE user_id = ?",
-                (user_id, ))
-            result = c.fetchone()
-            current_time = datetime.now()
-
-            if not result:
-                # New user welcome bonus with animation
-                bonus_points = random.randint(1, 40)
-                c.execute(
-                    "INSERT INTO rewards (user_id, points, last_daily, username) VALUES (?, ?, ?, ?)",
-                    (user_id, bonus_points,
-                     current_time.strftime('%Y-%m-%d %H:%M:%S'),
-                     interaction.user.name))
-                conn.commit()
-
-                reward_msg = await interaction.followup.send(
-                    "🎲 **Rolling your welcome bonus**... \n╰⊱⭑⭑⭑⊱╮",
+        else:
+            last_claim = datetime.strptime(
+                result[0],
+                '%Y-%m-%d %H:%M:%S') if result[0] else datetime.min
+            current_points = result[1] or 0
+
+            if current_time.date() <= last_claim.date():
+                time_remaining = datetime.combine(
+                    last_claim.date() + timedelta(days=1),
+                    datetime.min.time()) - current_time
+                hours, remainder = divmod(time_remaining.seconds, 3600)
+                minutes, _ = divmod(remainder, 60)
+
+                await interaction.followup.send(
+                    f"⏰ **Not so fast, sweetie!**\n"
+                    f"Next reward in: **{hours}h {minutes}m**\n"
+                    f"╰⊱💖⊱╮",
                     ephemeral=True)
-                await asyncio.sleep(1.5)
-                await reward_msg.edit(content=f"🎉 **WELCOME BONUS!** 🎊\n"
-                                      f"You won **+{bonus_points} points!**\n"
-                                      f"╰⊱{'⭐' * (bonus_points // 8 + 1)}⊱╮")
 
             else:
-                last_claim = datetime.strptime(
-                    result[0],
-                    '%Y-%m-%d %H:%M:%S') if result[0] else datetime.min
-                current_points = result[1] or 0
-
-                if current_time.date() <= last_claim.date():
-                    time_remaining = datetime.combine(
-                        last_claim.date() + timedelta(days=1),
-                        datetime.min.time()) - current_time
-                    hours, remainder = divmod(time_remaining.seconds, 3600)
-                    minutes, _ = divmod(remainder, 60)
-
-                    await interaction.followup.send(
-                        f"⏰ **Not so fast, sweetie!**\n"
-                        f"Next reward in: **{hours}h {minutes}m**\n"
-                        f"╰⊱💖⊱╮",
-                        ephemeral=True)
+                # Animated daily reward claim
+                initial_msg = await interaction.followup.send(
+                    "🎲 **Rolling your daily reward**...\n╰⊱⭑⭑⭑⊱╮",
+                    ephemeral=True)
+                await asyncio.sleep(1)
 
-                else:
-                    # Animated daily reward claim
-                    initial_msg = await interaction.followup.send(
-                        "🎲 **Rolling your daily reward**...\n╰⊱⭑⭑⭑⊱╮",
-                        ephemeral=True)
-                    await asyncio.sleep(1)
-
-                    bonus_points = random.randint(1, 40)
-                    c.execute(
-                        "UPDATE rewards SET points = points + ?, last_daily = ? WHERE user_id = ?",
-                        (bonus_points,
-                         current_time.strftime('%Y-%m-%d %H:%M:%S'), user_id))
-                    conn.commit()
-
-                    c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                              (user_id, ))
-                    new_total = c.fetchone()[0]
-
-                    # Show bonus animation based on points
-                    stars = '⭐' * (bonus_points // 8 + 1)
-                    await initial_msg.edit(
-                        content=f"🎉 **DAILY REWARD!** 🎊\n"
-                        f"You won **+{bonus_points} points!**\n"
-                        f"Total balance: **{new_total} points**\n"
-                        f"╰⊱{stars}⊱╮")
-
-        finally:
-            conn.close()
+                bonus_points = random.randint(1, 40)
+                new_total = await points_engine.grant(
+                    user_id,
+                    bonus_points,
+                    ledger.SOURCE_DAILY,
+                    last_daily=current_time.strftime('%Y-%m-%d %H:%M:%S'))
+
+                # Show bonus animation based on points
+                stars = '⭐' * (bonus_points // 8 + 1)
+                await initial_msg.edit(
+                    content=f"🎉 **DAILY REWARD!** 🎊\n"
+                    f"You won **+{bonus_points} points!**\n"
+                    f"Total balance: **{new_total} points**\n"
+                    f"╰⊱{stars}⊱╮")
 
     except Exception as e:
         print(f"Daily reward error: {str(e)}")
@@ -587,22 +787,98 @@ class AdminView(View):
             await interaction.response.send_message(
                 "❌ You don't have permission to do this!", ephemeral=True)
             return
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
-        c.execute("SELECT * FROM orders ORDER BY order_id DESC LIMIT 10")
-        orders = c.fetchall()
-        conn.close()
+        await PagedView.open(interaction, orders_query(), render_orders)
+
+
+class PagedView(View):
+    """Prev/Next browsing over a :class:`KeysetQuery`."""
+
+    def __init__(self, owner_id, query, render):
+        super().__init__(timeout=300)
+        self.owner_id = owner_id
+        self.query = query
+        self.render = render
+        self.first_key = None
+        self.last_key = None
+
+    @classmethod
+    async def open(cls, interaction: discord.Interaction, query, render):
+        view = cls(interaction.user.id, query, render)
+        embed = await view.load()
+        await interaction.response.send_message(embed=embed, view=view)
+
+    async def load(self, before=None, after=None):
+        rows, has_older, has_newer = await self.query.page(db,
+                                                           before=before,
+                                                           after=after)
+        if rows:
+            self.first_key, self.last_key = rows[0][0], rows[-1][0]
+        self.newer_button.disabled = not has_newer
+        self.older_button.disabled = not has_older
+        return self.render(rows)
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.user.id != self.owner_id:
+            await interaction.response.send_message(
+                "❌ Run the command yourself to browse!", ephemeral=True)
+            return False
+        return True
 
-        embed = discord.Embed(title="📋 All Orders", color=discord.Color.blue())
-        for order in orders:
-            member = interaction.guild.get_member(order[1])
-            username = member.name if member else "Unknown User"  # Handle cases where member is not found
-            embed.add_field(
-                name=f"Order #{order[0]}",
-                value=
-                f"User: {username} (<@{order[1]}>)\nItem: {order[2]}\nQuantity: {order[3]}\nStatus: {order[4]}",
-                inline=False)
-        await interaction.response.send_message(embed=embed)
+    @discord.ui.button(label="◀️ Newer", style=discord.ButtonStyle.grey)
+    async def newer_button(self, interaction: discord.Interaction,
+                           button: Button):
+        embed = await self.load(after=self.first_key)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="Older ▶️", style=discord.ButtonStyle.grey)
+    async def older_button(self, interaction: discord.Interaction,
+                           button: Button):
+        embed = await self.load(before=self.last_key)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+
+def orders_query(status=None, user_id=None):
+    return KeysetQuery(
+        'orders', 'order_id',
+        ['order_id', 'user_id', 'username', 'substr(item, 1, 200)',
+         'quantity', 'status'],
+        filters={'status': status, 'user_id': user_id},
+        page_size=10)
+
+
+def render_orders(orders):
+    embed = discord.Embed(title="📋 All Orders", color=discord.Color.blue())
+    if not orders:
+        embed.description = "No orders found."
+    for order_id, user_id, username, item, quantity, status in orders:
+        embed.add_field(
+            name=f"Order #{order_id}",
+            value=
+            f"User: {username or 'Unknown User'} (<@{user_id}>)\nItem: {item}\nQuantity: {quantity}\nStatus: {status}",
+            inline=False)
+    return embed
+
+
+def feedback_query(user_id=None):
+    return KeysetQuery(
+        'feedback', 'feedback_id',
+        ['feedback_id', 'username', 'rating', 'substr(comment, 1, 300)'],
+        filters={'user_id': user_id},
+        page_size=5)
+
+
+def render_feedback(reviews):
+    embed = discord.Embed(title="💖 Customer Reviews",
+                          color=discord.Color.pink())
+    if not reviews:
+        embed.description = "No reviews yet."
+    for feedback_id, username, rating, comment in reviews:
+        embed.add_field(
+            name=f"Review #{feedback_id}",
+            value=
+            f"From: {username or 'Unknown User'}\nRating: {'⭐' * (rating or 0)}\nComment: {comment}",
+            inline=False)
+    return embed
 
 
 class UpdateOrderModal(discord.ui.Modal, title="📝 Update Order Status"):
@@ -621,12 +897,8 @@ class UpdateOrderModal(discord.ui.Modal, title="📝 Update Order Status"):
             order_id = int(self.order_id.value)
             status = self.status.value
 
-            conn = sqlite3.connect('orders.db')
-            c = conn.cursor()
-            c.execute("UPDATE orders SET status = ? WHERE order_id = ?",
-                      (status, order_id))
-            conn.commit()
-            conn.close()
+            await db.execute("UPDATE orders SET status = ? WHERE order_id = ?",
+                             (status, order_id))
 
             await interaction.response.send_message(
                 f"✅ Order #{order_id} status updated to: {status}",
@@ -636,6 +908,45 @@ class UpdateOrderModal(discord.ui.Modal, title="📝 Update Order Status"):
                 "❌ Invalid order ID format", ephemeral=True)
 
 
+# Member lookups for admin point tools
+member_index = MemberIndex()
+
+
+async def find_member(interaction: discord.Interaction, text: str):
+    """Resolves a typed name or ID, replying with suggestions if ambiguous."""
+    member, matches = member_index.resolve(interaction.guild, text)
+    if member:
+        return member
+
+    if matches:
+        names_list = "\n".join(f"{m.display_name} (ID: {m.id})"
+                               for m in matches[:10])
+        await interaction.response.send_message(
+            f"❌ Multiple matches found! Please use their ID:\n{names_list}",
+            ephemeral=True)
+        return None
+
+    active_members = itertools.islice(
+        (m for m in interaction.guild.members if not m.bot), 10)
+    names_list = "\n".join(f"{m.display_name} (ID: {m.id})"
+                           for m in active_members)
+    await interaction.response.send_message(
+        f"❌ User not found! Here are some active members:\n{names_list}\n\nTry using their ID or exact name.",
+        ephemeral=True)
+    return None
+
+
+async def member_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggests guild members for the ``member`` argument."""
+    if not interaction.guild or not current:
+        return []
+    return [
+        discord.app_commands.Choice(name=f"{m.display_name} ({m.name})"[:100],
+                                    value=str(m.id))
+        for m in member_index.search(interaction.guild, current, limit=25)
+    ]
+
+
 class GivePointsModal(discord.ui.Modal, title="🎁 Give Points"):
     username = discord.ui.TextInput(
         label="Discord Name or ID",
@@ -661,150 +972,21 @@ class GivePointsModal(discord.ui.Modal, title="🎁 Give Points"):
                     "❌ Points must be a valid number!", ephemeral=True)
                 return
 
-            # Execute add_points command logic
-            input_value = self.username.value.lower().strip()
-            member = None
-
-            # Try to find member by ID first
-            if input_value.isdigit():
-                member = interaction.guild.get_member(int(input_value))
-
-            # Try to find by name if ID didn't work
+            member = await find_member(interaction, self.username.value)
             if not member:
-                for m in interaction.guild.members:
-                    if (input_value == m.name.lower()
-                            or input_value == m.display_name.lower()
-                            or (m.nick and input_value == m.nick.lower())):
-                        member = m
-                        break
-
-            # If still not found, try partial matches
-            if not member:
-                matches = []
-                for m in interaction.guild.members:
-                    if (input_value in m.name.lower()
-                            or input_value in m.display_name.lower()
-                            or (m.nick and input_value in m.nick.lower())):
-                        matches.append(m)
-
-                if len(matches) == 1:
-                    member = matches[0]
-                elif len(matches) > 1:
-                    names_list = "\n".join(f"{m.display_name} (ID: {m.id})"
-                                           for m in matches[:10])
-                    await interaction.response.send_message(
-                        f"❌ Multiple matches found! Please use their ID:\n{names_list}",
-                        ephemeral=True)
-                    return
-
-            if not member:
-                active_members = [
-                    m for m in interaction.guild.members if not m.bot
-                ][:10]
-                names_list = "\n".join(f"{m.display_name} (ID: {m.id})"
-                                       for m in active_members)
-                await interaction.response.send_message(
-                    f"❌ User not found! Here are some active members:\n{names_list}\n\nTry using their ID or exact name.",
-                    ephemeral=True)
                 return
 
-            conn = sqlite3.connect('orders.db')
-            c = conn.cursor()
-
             # Add points and update username
-            c.execute(
-                "INSERT INTO rewards (user_id, points, username) VALUES (?, ?, ?) ON CONFLICT(user_id) DO UPDATE SET points = points + ?, username = ?",
-                (member.id, points, member.display_name, points,
-                 member.display_name))
-
-            # Get new total
-            c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                      (member.id, ))
-            new_total = c.fetchone()[0]
-
-            conn.commit()
-            conn.close()
+            new_total = await points_engine.grant(member.id, points,
+                                                  ledger.SOURCE_ADMIN_GIVE,
+                                                  member.display_name)
 
             await interaction.response.send_message(
                 f"✅ Added {points} points to {member.display_name}\nNew total: {new_total} points",
                 ephemeral=True)
 
-            # Find member
-            input_value = self.username.value.lower().strip()
-            member = None
-
-            # Try to find member by ID first
-            if input_value.isdigit():
-                member = interaction.guild.get_member(int(input_value))
-
-            # Try to find by name if ID didn't work
-            if not member:
-                for m in interaction.guild.members:
-                    if (input_value == m.name.lower()
-                            or input_value == m.display_name.lower()
-                            or (m.nick and input_value == m.nick.lower())):
-                        member = m
-                        break
-
-            # If still not found, try partial matches
-            if not member:
-                matches = []
-                for m in interaction.guild.members:
-                    if (input_value in m.name.lower()
-                            or input_value in m.display_name.lower()
-                            or (m.nick and input_value in m.nick.lower())):
-                        matches.append(m)
-
-                if len(matches) == 1:
-                    member = matches[0]
-                elif len(matches) > 1:
-                    # Multiple matches found
-                    names_list = "\n".join(f"{m.display_name} (ID: {m.id})"
-                                           for m in matches[:10])
-                    await interaction.response.send_message(
-                        f"❌ Multiple matches found! Please use their ID:\n{names_list}",
-                        ephemeral=True)
-                    return
-
-            if not member:
-                # No matches found
-                active_members = [
-                    m for m in interaction.guild.members if not m.bot
-                ][:10]
-                names_list = "\n".join(f"{m.display_name} (ID: {m.id})"
-                                       for m in active_members)
-                await interaction.response.send_message(
-                    f"❌ User not found! Here are some active members:\n{names_list}\n\nTry using their ID or exact name.",
-                    ephemeral=True)
-                return
-
-            # Add points
-            conn = sqlite3.connect('orders.db')
-            c = conn.cursor()
-
-            try:
-                c.execute(
-                    "INSERT INTO rewards (user_id, points, username) VALUES (?, ?, ?) ON CONFLICT(user_id) DO UPDATE SET points = points + ?, username = ?",
-                    (member.id, points, member.display_name, points,
-                     member.display_name))
-                conn.commit()
-
-                # Verify points were added
-                c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                          (member.id, ))
-                new_points = c.fetchone()[0]
-
-                await interaction.response.send_message(
-                    f"✅ Added {points} points to {member.display_name}\nNew total: {new_points} points",
-                    ephemeral=True)
-
-            except sqlite3.Error as e:
-                await interaction.response.send_message(
-                    f"❌ Database error: {str(e)}", ephemeral=True)
-            finally:
-                conn.close()
-
-        except Exception as e:            await interaction.response.send_message(
+        except Exception as e:
+            await interaction.response.send_message(
                 f"❌ An error occurred: {str(e)}\nTry using the member's ID instead.",
                 ephemeral=True)
 
@@ -834,130 +1016,24 @@ class RemovePointsModal(discord.ui.Modal, title="➖ Remove Points"):
                     "❌ Points must be a valid number!", ephemeral=True)
                 return
 
-            input_value = self.username.value.lower().strip()
-            member = None
-
-            # Try to find member by ID first
-            if input_value.isdigit():
-                member = interaction.guild.get_member(int(input_value))
-
-            # Try to find by name if ID didn't work
-            if not member:
-                for m in interaction.guild.members:
-                    if (input_value == m.name.lower()
-                            or input_value == m.display_name.lower()
-                            or (m.nick and input_value == m.nick.lower())):
-                        member = m
-                        break
-
+            member = await find_member(interaction, self.username.value)
             if not member:
-                matches = []
-                for m in interaction.guild.members:
-                    if (input_value in m.name.lower()
-                            or input_value in m.display_name.lower()
-                            or (m.nick and input_value in m.nick.lower())):
-                        matches.append(m)
-
-                if len(matches) == 1:
-                    member = matches[0]
-                elif len(matches) > 1:
-                    names_list = "\n".join(f"{m.display_name} (ID: {m.id})"
-                                           for m in matches[:10])
-                    await interaction.response.send_message(
-                        f"❌ Multiple matches found! Please use their ID:\n{names_list}",
-                        ephemeral=True)
-                    return
-
-            if not member:
-                active_members = [
-                    m for m in interaction.guild.members if not m.bot
-                ][:10]
-                names_list = "\n".join(f"{m.display_name} (ID: {m.id})"
-                                       for m in active_members)
-                await interaction.response.send_message(
-                    f"❌ User not found! Here are some active members:\n{names_list}\n\nTry using their ID or exact name.",
-                    ephemeral=True)
                 return
 
-            conn = sqlite3.connect('orders.db')
-            c = conn.cursor()
+            # Remove points and update username in one conditional update
+            new_total = await points_engine.deduct(member.id, points,
+                                                   ledger.SOURCE_ADMIN_REMOVE,
+                                                   member.display_name)
 
-            # Check current points
-            c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                      (member.id, ))
-            result = c.fetchone()
-
-            if not result or result[0] < points:
+            if new_total is None:
                 await interaction.response.send_message(
                     f"❌ {member.display_name} doesn't have enough points to remove!",
                     ephemeral=True)
-                conn.close()
                 return
 
-            # Remove points and update username
-            c.execute(
-                "UPDATE rewards SET points = points - ?, username = ? WHERE user_id = ?",
-                (points, member.display_name, member.id))
-
-            # Get new total
-            c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                      (member.id, ))
-            new_total = c.fetchone()[0]
-
-            conn.commit()
-            conn.close()
-
             await interaction.response.send_message(
                 f"✅ Removed {points} points from {member.display_name}\nNew total: {new_total} points",
                 ephemeral=True)
-
-            # Try to find member by ID first
-            if input_value.isdigit():
-                member = interaction.guild.get_member(int(input_value))
-
-            if not member:
-                # Try different name matching methods
-                for m in interaction.guild.members:
-                    if (input_value in m.name.lower()
-                            or input_value in m.display_name.lower()
-                            or input_value == str(m.id)
-                            or (m.nick and input_value in m.nick.lower())):
-                        member = m
-                        break
-
-            if not member:
-                # Show active members if not found
-                active_members = [
-                    m for m in interaction.guild.members if not m.bot
-                ][:10]
-                names_list = "\n".join(f"{m.display_name} (ID: {m.id})"
-                                       for m in active_members)
-                await interaction.response.send_message(
-                    f"❌ User not found! Here are some active members:\n{names_list}\n\nTry using their ID or exact name.",
-                    ephemeral=True)
-                return
-
-            points = int(self.points.value)
-
-            conn = sqlite3.connect('orders.db')
-            c = conn.cursor()
-            c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                      (member.id, ))
-            result = c.fetchone()
-
-            if result and result[0] >= points:
-                c.execute(
-                    "UPDATE rewards SET points = points - ? WHERE user_id = ?",
-                    (points, member.id))
-                conn.commit()
-                await interaction.response.send_message(
-                    f"✅ Removed {points} points from {member.display_name}",
-                    ephemeral=True)
-            else:
-                await interaction.response.send_message(
-                    f"❌ {member.display_name} does not have enough points.",
-                    ephemeral=True)
-            conn.close()
         except ValueError:
             await interaction.response.send_message("❌ Invalid input format",
                                                     ephemeral=True)
@@ -979,44 +1055,24 @@ async def admin(ctx):
 
 @bot.tree.command(name="view_all_orders",
                   description="View all orders (Admin only)")
-@is_admin()
-async def view_all_orders(interaction: discord.Interaction):
-    conn = sqlite3.connect('orders.db')
-    c = conn.cursor()
-    c.execute("SELECT * FROM orders ORDER BY order_id DESC LIMIT 10")
-    orders = c.fetchall()
-    conn.close()
-
-    embed = discord.Embed(title="📋 All Orders", color=discord.Color.blue())
-    for order in orders:
-        member = interaction.guild.get_member(order[1])
-        username = member.name if member else "Unknown User"  #Handle cases where member is not found
-        embed.add_field(
-            name=f"Order #{order[0]}",
-            value=
-            f"User: {username}\nItem: {order[2]}\nQuantity: {order[3]}\nStatus: {order[4]}",
-            inline=False)
-    await interaction.response.send_message(embed=embed)
+@discord.app_commands.default_permissions(manage_guild=True)
+@is_app_admin()
+async def view_all_orders(interaction: discord.Interaction,
+                          status: str = None,
+                          member: discord.Member = None):
+    query = orders_query(status=status,
+                         user_id=member.id if member else None)
+    await PagedView.open(interaction, query, render_orders)
 
 
 @bot.tree.command(name="view_feedback",
-                  description="View the last 5 customer reviews")
-@is_admin()
-async def view_feedback(interaction: discord.Interaction):
-    conn = sqlite3.connect('orders.db')
-    c = conn.cursor()
-    c.execute("SELECT * FROM feedback ORDER BY feedback_id DESC LIMIT 5")
-    reviews = c.fetchall()
-    conn.close()
-
-    embed = discord.Embed(title="💖 Customer Reviews",
-                          color=discord.Color.pink())
-    for review in reviews:
-        embed.add_field(
-            name=f"Review #{review[0]}",
-            value=f"Rating: {'⭐' * review[2]}\nComment: {review[3]}",
-            inline=False)
-    await interaction.response.send_message(embed=embed)
+                  description="Browse customer reviews, newest first")
+@discord.app_commands.default_permissions(manage_guild=True)
+@is_app_admin()
+async def view_feedback(interaction: discord.Interaction,
+                        member: discord.Member = None):
+    query = feedback_query(user_id=member.id if member else None)
+    await PagedView.open(interaction, query, render_feedback)
 
 
 @bot.tree.command(name="vip_apply",
@@ -1031,31 +1087,23 @@ async def vip_apply(interaction: discord.Interaction):
                 ephemeral=True)
             return
 
-        # Add user to rewards program
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
-
         # Add to rewards if not exists
-        c.execute("INSERT OR IGNORE INTO rewards (user_id, points, loyalty_tier, username) VALUES (?, ?, ?, ?)",
-                 (interaction.user.id, 50, "Flirty Bronze", interaction.user.display_name))
-        conn.commit()
-        conn.close()
+        await points_engine.enroll(interaction.user.id, 50,
+                                   interaction.user.display_name)
 
         # Assign VIP role
         vip_role = interaction.guild.get_role(1337508682417700961)
         if vip_role:
             await interaction.user.add_roles(vip_role)
 
-            # Send notification to VIP channel
-            vip_channel = interaction.client.get_channel(1337646191994867772)
-            if vip_channel:
-                welcome_embed = discord.Embed(
-                    title="🎉 New VIP Member!",
-                    description=f"Welcome {interaction.user.mention} to Sweet Holes VIP!",
-                    color=discord.Color.gold())
-                await vip_channel.send(embed=welcome_embed)
-
             await interaction.response.send_message("✅ Welcome to Sweet Holes VIP! Your role has been assigned! 🎉", ephemeral=True)
+
+            # Queue notification to VIP channel after replying
+            welcome_embed = discord.Embed(
+                title="🎉 New VIP Member!",
+                description=f"Welcome {interaction.user.mention} to Sweet Holes VIP!",
+                color=discord.Color.gold())
+            await outbox.enqueue(1337646191994867772, welcome_embed)
             return
         else:
             await interaction.response.send_message("❌ There was an issue assigning the VIP role. Please contact an admin.", ephemeral=True)
@@ -1070,37 +1118,24 @@ async def vip_apply(interaction: discord.Interaction):
 async def signup_rewards(interaction: discord.Interaction):
     try:
         user_id = interaction.user.id
-        membership_channel = bot.get_channel(1337508682950377480)
 
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
-
-        # Check if user already exists
-        c.execute("SELECT points FROM rewards WHERE user_id =?", (user_id, ))
-        existing_user = c.fetchone()
-
-        if existing_user:
-            await interaction.response.send_message(
-                "💝 You're already enrolled in our rewards program, sweetie!",
-                ephemeral=True)
-            conn.close()
-            return
-
-        # Add new user to rewards with their display name
+        # Add new user to rewards with their display name; the welcome
+        # message to the membership channel commits with the enrollment
         display_name = interaction.user.display_name
-        c.execute(
-            "INSERT INTO rewards (user_id, points, loyalty_tier, username) VALUES (?, ?, ?, ?)",
-            (user_id, 50, "Flirty Bronze", display_name))
-        conn.commit()
-        conn.close()
-
-        # Send welcome message to membership channel
         welcome_embed = discord.Embed(
             title="🎉 New Sweet Heart Joined!",
             description=
             f"Welcome <@{user_id}> to our VIP Rewards Program!\nStarting with 50 bonus points! 💖",
             color=discord.Color.pink())
-        await membership_channel.send(embed=welcome_embed)
+        if not await points_engine.enroll(
+                user_id, 50, display_name,
+                also=lambda c: outbox.add(c, 1337508682950377480,
+                                          welcome_embed)):
+            await interaction.response.send_message(
+                "💝 You're already enrolled in our rewards program, sweetie!",
+                ephemeral=True)
+            return
+        outbox.wake()
 
         await interaction.response.send_message(
             "✨ Welcome to Sweet Holes Rewards! You've earned 50 bonus points!",
@@ -1109,39 +1144,55 @@ async def signup_rewards(interaction: discord.Interaction):
     except Exception as e:
         await interaction.response.send_message(
             "❌ Something went wrong! Please try again.", ephemeral=True)
-        if 'conn' in locals():
-            conn.close()
 
 
 @bot.tree.command(name="vip_report", description="Generate VIPbusiness report")
-@is_admin()
-async def vip_report(interaction: discord.Interaction):
-    conn = sqlite3.connect('orders.db')
-    c = conn.cursor()
-
-    # Get today's orders
-    c.execute(
-        "SELECT COUNT(*), SUM(quantity) FROM orders WHERE date(datetime('now'))"
-    )
-    orders_data = c.fetchone()
-    daily_orders = orders_data[0] or 0
-    daily_items = orders_data[1] or 0
+@discord.app_commands.default_permissions(manage_guild=True)
+@is_app_admin()
+async def vip_report(interaction: discord.Interaction,
+                     start: str = None,
+                     end: str = None):
+    """Business totals for a date range (YYYY-MM-DD, UTC), default today."""
+    try:
+        today = datetime.utcnow().date()
+        start_day = datetime.strptime(start, '%Y-%m-%d').date() if start else today
+        end_day = datetime.strptime(end, '%Y-%m-%d').date() if end else (
+            start_day if start else today)
+    except ValueError:
+        await interaction.response.send_message(
+            "❌ Dates must look like 2025-02-14!", ephemeral=True)
+        return
+    if end_day < start_day:
+        start_day, end_day = end_day, start_day
 
-    # Get point redemptions
-    c.execute("SELECT COUNT(*) FROM rewards WHERE points > 0")
-    total_vip = c.fetchone()[0] or 0
+    # Read from the daily rollups only
+    totals = await daily_totals(db, start_day.isoformat(), end_day.isoformat())
 
-    conn.close()
+    # Index-only count of members with a balance
+    total_vip = (await db.fetchone(
+        "SELECT COUNT(*) FROM rewards WHERE points > 0"))[0] or 0
 
+    period = (start_day.isoformat() if start_day == end_day else
+              f"{start_day.isoformat()} → {end_day.isoformat()}")
     embed = discord.Embed(title="📊 VIP Business Report",
+                          description=f"📅 {period} (UTC)",
                           color=discord.Color.gold())
-    embed.add_field(name="Daily Orders", value=str(daily_orders), inline=True)
-    embed.add_field(name="Items Sold", value=str(daily_items), inline=True)
+    embed.add_field(name="Orders", value=str(totals.orders), inline=True)
+    embed.add_field(name="Items Sold", value=str(totals.items), inline=True)
+    embed.add_field(name="New Members",
+                    value=str(totals.new_members),
+                    inline=True)
+    embed.add_field(name="Points Issued",
+                    value=str(totals.points_issued),
+                    inline=True)
+    embed.add_field(name="Points Redeemed",
+                    value=str(totals.points_redeemed),
+                    inline=True)
     embed.add_field(name="Total VIP Members",
                     value=str(total_vip),
                     inline=True)
 
-    await interaction.response.send_message(embed)
+    await interaction.response.send_message(embed=embed)
 
 
 class RedeemView(discord.ui.View):
@@ -1223,124 +1274,42 @@ class RedeemView(discord.ui.View):
                        style=discord.ButtonStyle.danger)
     async def redeem_vendor(self, interaction: discord.Interaction,
                             button: discord.ui.Button):
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
-        c.execute("SELECT * FROM vendor_rewards")
-        rewards = c.fetchall()
-        conn.close()
+        # Served from the in-memory catalog; rebuilt only when it changes
+        rendered = await vendor_catalog.rendered(render_vendor_rewards)
 
-        if not rewards:
+        if not rendered:
             await interaction.response.send_message(
                 "❌ No vendor rewards available!", ephemeral=True)
             return
 
-        embed = discord.Embed(
-            title="🏪 Available Vendor Rewards",
-            description="Click the buttons below to claim rewards:",
-            color=discord.Color.gold())
-
-        view = discord.ui.View()
-
-        for reward in rewards:
-            embed.add_field(
-                name=f"ID #{reward[0]}: {reward[2]} ({reward[3]} points)",
-                value=reward[4],
-                inline=False)
-
-            button = discord.ui.Button(label=f"Claim {reward[2]}",
-                                       style=discord.ButtonStyle.success,
-                                       custom_id=f"claim_vendor_{reward[0]}")
-
-            async def claim_callback(interaction: discord.Interaction,
-                                     reward_id: int = reward[0]):
-                conn = sqlite3.connect('orders.db')
-                c = conn.cursor()
-
-                # Get reward details
-                c.execute("SELECT * FROM vendor_rewards WHERE reward_id = ?",
-                          (reward_id, ))
-                reward_data = c.fetchone()
-
-                if not reward_data:
-                    await interaction.response.send_message(
-                        "❌ Reward no longer available!", ephemeral=True)
-                    conn.close()
-                    return
-
-                # Check user points
-                c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                          (interaction.user.id, ))
-                user_points = c.fetchone()
-
-                if not user_points or user_points[0] < reward_data[3]:
-                    await interaction.response.send_message(
-                        f"❌ Not enough points! You need {reward_data[3]} points.",
-                        ephemeral=True)
-                    conn.close()
-                    return
-
-                # Deduct points and log redemption
-                c.execute(
-                    "UPDATE rewards SET points = points - ? WHERE user_id = ?",
-                    (reward_data[3], interaction.user.id))
-                conn.commit()
-                conn.close()
-
-                # Notify staff
-                staff_channel = interaction.client.get_channel(
-                    1337712800453230643)
-                if staff_channel:
-                    log_embed = discord.Embed(
-                        title="🏪 Vendor Reward Claimed",
-                        description=
-                        f"User: {interaction.user.mention}\nReward: {reward_data[2]}\nPoints: {reward_data[3]}",
-                        color=discord.Color.gold(),
-                        timestamp=datetime.now())
-                    await staff_channel.send(embed=log_embed)
-
-                await interaction.response.send_message(
-                    f"✅ Successfully claimed {reward_data[2]}!",
-                    ephemeral=True)
-
-            button.callback = lambda i, r=reward[0]: claim_callback(i, r)
-            view.add_item(button)
-
+        embed, view = rendered
         await interaction.response.send_message(embed=embed,
                                                 view=view,
                                                 ephemeral=True)
 
     async def process_redemption(self, interaction: discord.Interaction,
                                  cost: int, item: str):
-        if self.points < cost:
+        # Deduct only if the balance covers it; self.points may be stale.
+        # The log notification commits with the deduction.
+        log_embed = discord.Embed(
+            title="🎁 New Reward Redemption",
+            description=
+            f"**User:** {interaction.user.mention}\n**Item:** {item}\n**Cost:** {cost} points",
+            color=discord.Color.gold(),
+            timestamp=datetime.now())
+        new_points = await points_engine.deduct(
+            interaction.user.id,
+            cost,
+            ledger.SOURCE_REDEMPTION,
+            reference=item,
+            also=lambda c: outbox.add(c, 1337712800453230643, log_embed))
+
+        if new_points is None:
             await interaction.response.send_message(
                 f"❌ Not enough points! You need {cost} points for {item}.",
                 ephemeral=True)
             return
 
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
-
-        # Verify current points and deduct
-        c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                  (interaction.user.id, ))
-        current_points = c.fetchone()
-
-        if not current_points or current_points[0] < cost:
-            await interaction.response.send_message(
-                "❌ Insufficient points for this redemption.", ephemeral=True)
-            conn.close()
-            return
-
-        c.execute("UPDATE rewards SET points = points - ? WHERE user_id = ?",
-                  (cost, interaction.user.id))
-        conn.commit()
-
-        # Get updated points
-        c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                  (interaction.user.id, ))
-        new_points = c.fetchone()[0]
-        conn.close()
-
         # Send confirmation to user
         user_embed = discord.Embed(
             title="🎉 Reward Redeemed!",
@@ -1348,19 +1317,82 @@ class RedeemView(discord.ui.View):
             f"Remaining points: **{new_points}**\n"
             f"A staff member will contact you soon!",
             color=discord.Color.green())
+        outbox.wake()
         await interaction.response.send_message(embed=user_embed,
                                                 ephemeral=True)
 
-        # Send notification to redemption log channel
-        log_channel = interaction.client.get_channel(1337712800453230643)
-        if log_channel:
-            log_embed = discord.Embed(
-                title="🎁 New Reward Redemption",
-                description=
-                f"**User:** {interaction.user.mention}\n**Item:** {item}\n**Cost:** {cost} points",
-                color=discord.Color.gold(),
-                timestamp=datetime.now())
-            await log_channel.send(embed=log_embed)
+
+async def claim_vendor_reward(interaction: discord.Interaction, reward_id: int):
+    # Get reward details
+    reward = await vendor_catalog.get(reward_id)
+
+    if not reward:
+        await interaction.response.send_message(
+            "❌ Reward no longer available!", ephemeral=True)
+        return
+
+    # Deduct points only if the balance covers the cost; staff are
+    # notified in the same transaction
+    log_embed = discord.Embed(
+        title="🏪 Vendor Reward Claimed",
+        description=
+        f"User: {interaction.user.mention}\nReward: {reward.reward_name}\nPoints: {reward.points_cost}",
+        color=discord.Color.gold(),
+        timestamp=datetime.now())
+    if await points_engine.deduct(
+            interaction.user.id,
+            reward.points_cost,
+            ledger.SOURCE_VENDOR_CLAIM,
+            reference=f"vendor_reward:{reward.reward_id}",
+            also=lambda c: outbox.add(c, 1337712800453230643, log_embed)
+    ) is None:
+        await interaction.response.send_message(
+            f"❌ Not enough points! You need {reward.points_cost} points.",
+            ephemeral=True)
+        return
+    outbox.wake()
+
+    await interaction.response.send_message(
+        f"✅ Successfully claimed {reward.reward_name}!", ephemeral=True)
+
+
+class VendorRewardsView(View):
+
+    def __init__(self, rewards):
+        super().__init__(timeout=None)  # Make the view persistent
+        for reward in rewards:
+            button = discord.ui.Button(
+                label=f"Claim {reward.reward_name}"[:80],
+                style=discord.ButtonStyle.success,
+                custom_id=f"claim_vendor_{reward.reward_id}")
+            button.callback = lambda i, r=reward.reward_id: claim_vendor_reward(
+                i, r)
+            self.add_item(button)
+
+
+def render_vendor_rewards(rewards):
+    """Builds the vendor rewards embed and claim buttons (max 25)."""
+    if not rewards:
+        return None
+
+    embed = discord.Embed(
+        title="🏪 Available Vendor Rewards",
+        description="Click the buttons below to claim rewards:",
+        color=discord.Color.gold())
+    for reward in rewards[:25]:
+        embed.add_field(
+            name=f"ID #{reward.reward_id}: {reward.reward_name} ({reward.points_cost} points)",
+            value=reward.description,
+            inline=False)
+
+    view = VendorRewardsView(rewards[:25])
+    bot.add_view(view)  # Keep claim buttons working on earlier messages
+    return embed, view
+
+
+def _insert_with_notification(c, sql, params, channel_id, embed):
+    c.execute(sql, params)
+    outbox.add(c, channel_id, embed)
 
 
 class ComplaintModal(discord.ui.Modal, title="📝 File a Complaint"):
@@ -1372,25 +1404,19 @@ class ComplaintModal(discord.ui.Modal, title="📝 File a Complaint"):
 
     async def on_submit(self, interaction: discord.Interaction):
         try:
-            conn = sqlite3.connect('orders.db')
-            c = conn.cursor()
-            c.execute(
+            # Queue for the complaints channel, in one transaction with the row
+            embed = discord.Embed(
+                title="⚠️ New Complaint Filed",
+                description=
+                f"From: {interaction.user.mention}\n\n{self.complaint.value}",
+                color=discord.Color.red(),
+                timestamp=datetime.now())
+            await db.transaction(
+                _insert_with_notification,
                 "INSERT INTO complaints (user_id, complaint, username) VALUES (?, ?, ?)",
-                (interaction.user.id, self.complaint.value, interaction.user.display_name))
-            conn.commit()
-            conn.close()
-
-            # Send to complaints channel
-            complaints_channel = interaction.client.get_channel(
-                1337706481755095100)
-            if complaints_channel:
-                embed = discord.Embed(
-                    title="⚠️ New Complaint Filed",
-                    description=
-                    f"From: {interaction.user.mention}\n\n{self.complaint.value}",
-                    color=discord.Color.red(),
-                    timestamp=datetime.now())
-                await complaints_channel.send(embed=embed)
+                (interaction.user.id, self.complaint.value, interaction.user.display_name),
+                1337706481755095100, embed)
+            outbox.wake()
 
             await interaction.response.send_message(
                 "✅ Your complaint has been filed and will be reviewed by staff.",
@@ -1410,25 +1436,19 @@ class SuggestionModal(discord.ui.Modal, title="💡 Make a Suggestion"):
 
     async def on_submit(self, interaction: discord.Interaction):
         try:
-            conn = sqlite3.connect('orders.db')
-            c = conn.cursor()
-            c.execute(
+            # Queue for the suggestions channel, in one transaction with the row
+            embed = discord.Embed(
+                title="💡 New Suggestion Received",
+                description=
+                f"From: {interaction.user.mention}\n\n{self.suggestion.value}",
+                color=discord.Color.green(),
+                timestamp=datetime.now())
+            await db.transaction(
+                _insert_with_notification,
                 "INSERT INTO suggestions (user_id, suggestion, username) VALUES (?, ?, ?)",
-                (interaction.user.id, self.suggestion.value, interaction.user.display_name))
-            conn.commit()
-            conn.close()
-
-            # Send to suggestions channel
-            suggestions_channel = interaction.client.get_channel(
-                1337706421545996399)
-            if suggestions_channel:
-                embed = discord.Embed(
-                    title="💡 New Suggestion Received",
-                    description=
-                    f"From: {interaction.user.mention}\n\n{self.suggestion.value}",
-                    color=discord.Color.green(),
-                    timestamp=datetime.now())
-                await suggestions_channel.send(embed=embed)
+                (interaction.user.id, self.suggestion.value, interaction.user.display_name),
+                1337706421545996399, embed)
+            outbox.wake()
 
             await interaction.response.send_message(
                 "✅ Thank you for your suggestion!", ephemeral=True)
@@ -1448,31 +1468,21 @@ class RemoveVendorRewardModal(discord.ui.Modal,
     async def on_submit(self, interaction: discord.Interaction):
         try:
             reward_id = int(self.reward_id.value)
-            conn = sqlite3.connect('orders.db')
-            c = conn.cursor()
 
             # Check if reward exists and belongs to the user
-            c.execute(
-                "SELECT vendor_id FROM vendor_rewards WHERE reward_id = ?",
-                (reward_id, ))
-            result = c.fetchone()
+            reward = await vendor_catalog.get(reward_id)
 
-            if not result:
+            if not reward:
                 await interaction.response.send_message("❌ Reward not found!",
                                                         ephemeral=True)
-                conn.close()
                 return
 
-            if result[0] != interaction.user.id:
+            if reward.vendor_id != interaction.user.id:
                 await interaction.response.send_message(
                     "❌ You can only remove your own rewards!", ephemeral=True)
-                conn.close()
                 return
 
-            c.execute("DELETE FROM vendor_rewards WHERE reward_id = ?",
-                      (reward_id, ))
-            conn.commit()
-            conn.close()
+            await vendor_catalog.remove(reward_id)
 
             await interaction.response.send_message(
                 "✅ Reward removed successfully!", ephemeral=True)
@@ -1500,24 +1510,10 @@ class VendorRewardModal(discord.ui.Modal, title="🏪 Add Vendor Reward"):
         try:
             points = int(self.points_cost.value)
 
-            conn = sqlite3.connect('orders.db')
-            c = conn.cursor()
-
-            # Create vendor rewards table if it doesn't exist
-            c.execute('''CREATE TABLE IF NOT EXISTS vendor_rewards
-                        (reward_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                         vendor_id INTEGER,
-                         reward_name TEXT,
-                         points_cost INTEGER,
-                         description TEXT)''')
-
-            c.execute(
-                "INSERT INTO vendor_rewards (vendor_id, reward_name, points_cost, description) VALUES (?, ?, ?, ?)",
-                (interaction.user.id, self.reward_name.value, points,
-                 self.description.value))
-
-            conn.commit()
-            conn.close()
+            await vendor_catalog.add(interaction.user.id,
+                                     interaction.user.display_name,
+                                     self.reward_name.value, points,
+                                     self.description.value)
 
             embed = discord.Embed(
                 title="✅ Vendor Reward Added",
@@ -1572,6 +1568,8 @@ async def suggestion(interaction: discord.Interaction):
 @bot.event
 async def on_member_join(member):
     """Sends a welcome message when a new member joins and assigns default role."""
+    member_index.add(member)
+
     try:
         # Assign default Customer role
         customer_role = discord.utils.get(member.guild.roles, name="Customers")
@@ -1602,6 +1600,8 @@ async def on_member_join(member):
 @bot.event
 async def on_member_remove(member):
     """Sends a goodbye message when a member leaves."""
+    member_index.remove(member)
+
     goodbye_channel = bot.get_channel(1337508682950377476)
     if goodbye_channel:
         embed = discord.Embed(
@@ -1616,8 +1616,23 @@ async def on_member_remove(member):
         await goodbye_channel.send(embed=embed)
 
 
-# Message XP cooldown tracking
-message_cooldowns = {}
+@bot.event
+async def on_guild_available(guild):
+    """Builds the member name index once the guild's members are cached."""
+    started = asyncio.get_running_loop().time()
+    await member_index.build(guild)
+    print(f"✅ Indexed {guild.member_count} members of {guild.name} in "
+          f"{asyncio.get_running_loop().time() - started:.2f}s")
+
+
+@bot.event
+async def on_member_update(before, after):
+    """Keeps the member name index current when names change."""
+    member_index.update(before, after)
+
+
+# Message XP cooldown tracking (1 minute between point rewards)
+message_cooldowns = Cooldowns(window=60)
 
 
 @bot.event
@@ -1628,30 +1643,15 @@ async def on_message(message):
     # Process commands if any
     await bot.process_commands(message)
 
-    # Check cooldown (1 minute between point rewards)
+    # Check and start the cooldown
     user_id = message.author.id
-    current_time = datetime.now()
-    if user_id in message_cooldowns:
-        if (current_time - message_cooldowns[user_id]).total_seconds() < 60:
-            return
+    if not message_cooldowns.hit(user_id):
+        return
 
     # Award points for activity
     points = random.randint(1, 3)  # Random points between 1-3
-    conn = sqlite3.connect('orders.db')
-    c = conn.cursor()
-
-    c.execute(
-        """INSERT INTO rewards (user_id, points, username) 
-                 VALUES (?, ?, ?) 
-                 ON CONFLICT(user_id) 
-                 DO UPDATE SET points = points + ?""",
-        (user_id, points, message.author.name, points))
-
-    conn.commit()
-    conn.close()
-
-    # Update cooldown
-    message_cooldowns[user_id] = current_time
+    activity_buffer.add(user_id, message.author.name, points,
+                        ledger.SOURCE_MESSAGE)
 
 
 @bot.event
@@ -1661,23 +1661,14 @@ async def on_reaction_add(reaction, user):
 
     # Award points for reactions
     points = 1
-    conn = sqlite3.connect('orders.db')
-    c = conn.cursor()
-
-    c.execute(
-        """INSERT INTO rewards (user_id, points, username) 
-                 VALUES (?, ?, ?) 
-                 ON CONFLICT(user_id) 
-                 DO UPDATE SET points = points + ?""",
-        (user.id, points, user.name, points))
-
-    conn.commit()
-    conn.close()
+    activity_buffer.add(user.id, user.name, points, ledger.SOURCE_REACTION)
 
 
 @bot.tree.command(name="add_points", description="Add points to a member")
-@is_admin()
-async def add_points(interaction: discord.Interaction, member: discord.Member,
+@discord.app_commands.autocomplete(member=member_autocomplete)
+@discord.app_commands.default_permissions(manage_guild=True)
+@is_app_admin()
+async def add_points(interaction: discord.Interaction, member: str,
                      points: int):
     try:
         if points <= 0:
@@ -1685,32 +1676,14 @@ async def add_points(interaction: discord.Interaction, member: discord.Member,
                 "❌ Points must be positive!", ephemeral=True)
             return
 
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
+        member = await find_member(interaction, member)
+        if not member:
+            return
 
         try:
-            # First check if user exists
-            c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                      (member.id, ))
-            result = c.fetchone()
-
-            if result:
-                # Update existing user
-                c.execute(
-                    "UPDATE rewards SET points = points + ?, username = ? WHERE user_id = ?",
-                    (points, member.display_name, member.id))
-            else:
-                # Insert new user
-                c.execute(
-                    "INSERT INTO rewards (user_id, points, username) VALUES (?, ?, ?)",
-                    (member.id, points, member.display_name))
-
-            conn.commit()
-
-            # Get new total
-            c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                      (member.id, ))
-            new_total = c.fetchone()[0]
+            new_total = await points_engine.grant(member.id, points,
+                                                  ledger.SOURCE_ADMIN_GIVE,
+                                                  member.display_name)
 
             await interaction.response.send_message(
                 f"✅ Added {points} points to {member.display_name}\nNew total: {new_total} points",
@@ -1718,8 +1691,6 @@ async def add_points(interaction: discord.Interaction, member: discord.Member,
         except sqlite3.Error as e:
             await interaction.response.send_message(
                 f"❌ Database error: {str(e)}", ephemeral=True)
-        finally:
-            conn.close()
 
     except Exception as e:
         await interaction.response.send_message(f"❌ Error: {str(e)}",
@@ -1728,43 +1699,32 @@ async def add_points(interaction: discord.Interaction, member: discord.Member,
 
 @bot.tree.command(name="remove_points",
                   description="Remove points from a member")
-@is_admin()
-async def remove_points(interaction: discord.Interaction,
-                        member: discord.Member, points: int):
+@discord.app_commands.autocomplete(member=member_autocomplete)
+@discord.app_commands.default_permissions(manage_guild=True)
+@is_app_admin()
+async def remove_points(interaction: discord.Interaction, member: str,
+                        points: int):
     try:
         if points <= 0:
             await interaction.response.send_message(
                 "❌ Points must be positive!", ephemeral=True)
             return
 
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
+        member = await find_member(interaction, member)
+        if not member:
+            return
 
-        # Check current points
-        c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                  (member.id, ))
-        result = c.fetchone()
+        # Remove points and update username in one conditional update
+        new_total = await points_engine.deduct(member.id, points,
+                                               ledger.SOURCE_ADMIN_REMOVE,
+                                               member.display_name)
 
-        if not result or result[0] < points:
+        if new_total is None:
             await interaction.response.send_message(
                 f"❌ {member.display_name} doesn't have enough points to remove!",
                 ephemeral=True)
-            conn.close()
             return
 
-        # Remove points and update username
-        c.execute(
-            "UPDATE rewards SET points = points - ?, username = ? WHERE user_id = ?",
-            (points, member.display_name, member.id))
-
-        # Get new total
-        c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                  (member.id, ))
-        new_total = c.fetchone()[0]
-
-        conn.commit()
-        conn.close()
-
         await interaction.response.send_message(
             f"✅ Removed {points} points from {member.display_name}\nNew total: {new_total} points",
             ephemeral=True)
@@ -1773,30 +1733,223 @@ async def remove_points(interaction: discord.Interaction,
                                                 ephemeral=True)
 
 
+@bot.tree.command(name="db_stats",
+                  description="Show database and cache metrics (Admin only)")
+@discord.app_commands.default_permissions(manage_guild=True)
+@is_app_admin()
+async def db_stats(interaction: discord.Interaction):
+    stats = db.writer_metrics()
+    embed = discord.Embed(title="🗄️ Database Writer", color=discord.Color.blue())
+    embed.add_field(name="Queue Depth", value=str(stats['queue_depth']))
+    embed.add_field(name="Batches", value=str(stats['batches']))
+    embed.add_field(name="Writes", value=str(stats['operations']))
+    embed.add_field(name="Batch Size (avg / max)",
+                    value=f"{stats['avg_batch_size']:.1f} / {stats['max_batch_size']}")
+    embed.add_field(
+        name="Commit Latency (avg / max)",
+        value=f"{stats['avg_commit_seconds'] * 1000:.1f} ms / "
+        f"{stats['max_commit_seconds'] * 1000:.1f} ms")
+    embed.add_field(name="Failed Batches", value=str(stats['failed_batches']))
+    cache = reward_cache.stats()
+    embed.add_field(name="Reward Cache (hits / misses)",
+                    value=f"{cache['hits']} / {cache['misses']} "
+                    f"({cache['hit_rate']:.0%}, {cache['size']} cached)")
+    if startup.ready_seconds is not None:
+        embed.add_field(name="Time to Ready",
+                        value=f"{startup.ready_seconds:.2f}s "
+                        f"({len(startup.errors)} failed steps)")
+    sent = outbox.stats()
+    embed.add_field(name="Outbox (pending / sent / retried / dropped)",
+                    value=f"{await outbox.pending()} / {sent['sent']} / "
+                    f"{sent['retried']} / {sent['dropped']}")
+    embed.add_field(name="Digests",
+                    value=f"{sent['digests']} sent, "
+                    f"{sent['coalesced']} messages saved")
+    cooldowns = message_cooldowns.stats()
+    embed.add_field(name="Message Cooldowns",
+                    value=f"{cooldowns['size']} tracked, "
+                    f"{cooldowns['evictions']} expired")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@bot.tree.command(name="sql_profile",
+                  description="Profile database queries (Admin only)")
+@discord.app_commands.default_permissions(manage_guild=True)
+@is_app_admin()
+async def sql_profile(interaction: discord.Interaction,
+                      action: Literal['on', 'off', 'top', 'reset'] = 'top',
+                      threshold_ms: int = None):
+    if threshold_ms is not None:
+        profiler.slow_ms = threshold_ms
+    if action == 'on':
+        profiler.enabled = True
+    elif action == 'off':
+        profiler.enabled = False
+    elif action == 'reset':
+        profiler.reset()
+
+    state = "on" if profiler.enabled else "off"
+    embed = discord.Embed(
+        title="🐢 SQL Profiler",
+        description=f"Profiling is **{state}**, slow threshold {profiler.slow_ms} ms",
+        color=discord.Color.blue())
+    for stmt in profiler.top(8):
+        plan = f"\n```{stmt.plan[:300]}```" if stmt.plan else ""
+        embed.add_field(
+            name=f"{stmt.calls} calls, {stmt.total * 1000:.0f} ms total, "
+            f"max {stmt.max * 1000:.1f} ms"[:256],
+            value=f"`{stmt.sql[:600]}`{plan}",
+            inline=False)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@bot.tree.command(name="export",
+                  description="Export a table as a gzipped CSV (Admin only)")
+@discord.app_commands.default_permissions(manage_guild=True)
+@is_app_admin()
+async def export(interaction: discord.Interaction,
+                 table: Literal['orders', 'rewards', 'complaints',
+                                'suggestions'],
+                 start: str = None,
+                 end: str = None,
+                 status: str = None):
+    """Dates are YYYY-MM-DD (inclusive); status filters orders."""
+    await interaction.response.defer(ephemeral=True)
+    try:
+        for day in (start, end):
+            if day:
+                datetime.strptime(day, '%Y-%m-%d')
+    except ValueError:
+        await interaction.followup.send("❌ Dates must look like 2025-02-14!",
+                                        ephemeral=True)
+        return
+
+    filename = None
+    try:
+        filename, count = await export_csv(db, table, start, end, status)
+        size = os.path.getsize(filename)
+        limit = interaction.guild.filesize_limit if interaction.guild else 8 * 1024 * 1024
+        if size > limit:
+            await interaction.followup.send(
+                f"❌ Export is {size / 1024 / 1024:.1f} MB, over the upload limit. Try a narrower date range.",
+                ephemeral=True)
+            return
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        await interaction.followup.send(
+            f"📦 Exported {count} {table} rows",
+            file=discord.File(filename, filename=f"{table}-{stamp}.csv.gz"),
+            ephemeral=True)
+    except Exception as e:
+        await interaction.followup.send(f"❌ Export failed: {e}",
+                                        ephemeral=True)
+    finally:
+        if filename:
+            os.remove(filename)
+
+
+@bot.tree.command(name="sync_commands",
+                  description="Force a slash command sync (Admin only)")
+@discord.app_commands.default_permissions(manage_guild=True)
+@is_app_admin()
+async def force_sync_commands(interaction: discord.Interaction):
+    await interaction.response.defer(ephemeral=True)
+    try:
+        await sync_commands(force=True)
+        await interaction.followup.send("✅ Slash commands synced!",
+                                        ephemeral=True)
+    except Exception as e:
+        await interaction.followup.send(f"❌ Sync failed: {e}",
+                                        ephemeral=True)
+
+
 @bot.tree.command(name="git_pull",
                   description="Pull latest changes from GitHub repository")
-@is_admin()
+@discord.app_commands.default_permissions(manage_guild=True)
+@is_app_admin()
 async def git_pull(interaction: discord.Interaction):
+    """Pulls without blocking the bot, streaming git's output as it runs.
+
+    Only extensions (currently just ``fun``) are reloaded in place, with
+    the command tree re-synced if their commands changed. Every other
+    module, including the database, points, outbox and panels, is listed
+    as needing a full restart; most deploys are not zero-downtime.
+    """
+    await interaction.response.defer(ephemeral=True)
+    message = await interaction.followup.send("⏳ Pulling latest changes…",
+                                              ephemeral=True,
+                                              wait=True)
+    tail = []
+    last_edit = 0.0
+
+    async def show(text):
+        await message.edit(content=text[-1900:])
+
+    async def on_line(line):
+        nonlocal last_edit
+        tail.append(line)
+        del tail[:-15]
+        now = asyncio.get_running_loop().time()
+        if now - last_edit >= 1.0:  # stay well under the edit rate limit
+            last_edit = now
+            await show("⏳ Pulling latest changes…\n```\n" +
+                       "\n".join(tail) + "\n```")
+
     try:
-        await interaction.response.defer(ephemeral=True)
+        before = (await git('rev-parse', 'HEAD')).strip()
+        output = await git('pull', '--ff-only', timeout=120, on_line=on_line)
+        after = (await git('rev-parse', 'HEAD')).strip()
+    except GitError as e:
+        await show(f"❌ Failed to pull changes: {e}\n```\n"
+                   f"{e.output[-1500:]}\n```")
+        return
+    except Exception as e:
+        await show(f"❌ Error executing git pull: {str(e)}")
+        return
 
-        # Execute git pull
-        import subprocess
-        process = subprocess.Popen(['git', 'pull'],
-                                   stdout=subprocess.PIPE,
-                                   stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate()
+    report = "```\n" + output[-800:] + "\n```"
+    if before == after:
+        await show(f"✅ Already up to date.\n{report}")
+        return
 
-        if process.returncode == 0:
-            await interaction.followup.send(
-                "✅ Successfully pulled latest changes!", ephemeral=True)
-        else:
-            error_msg = stderr.decode('utf-8')
-            await interaction.followup.send(
-                f"❌ Failed to pull changes: {error_msg}", ephemeral=True)
+    try:
+        paths = await changed_files(before, after)
+        reloaded, failed, restart = await reload_changed(bot, paths)
+        if reloaded:
+            instrument_commands(bot.tree)
+            await sync_commands()
     except Exception as e:
-        await interaction.followup.send(
-            f"❌ Error executing git pull: {str(e)}", ephemeral=True)
+        await show(f"⚠️ Pulled {before[:7]}..{after[:7]} but reloading "
+                   f"failed: {str(e)}\n{report}")
+        return
+
+    lines = [f"✅ Pulled {before[:7]}..{after[:7]} "
+             f"({len(paths)} files changed)"]
+    if reloaded:
+        lines.append(f"🔄 Reloaded: {', '.join(reloaded)}")
+    for name, error in failed:
+        lines.append(f"❌ {name} failed to reload, old version kept: {error}")
+    if restart:
+        lines.append(f"♻️ Restart needed for: {', '.join(restart)}")
+    print(" | ".join(lines))
+    await show("\n".join(lines) + "\n" + report)
+
+
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction,
+                               error: discord.app_commands.AppCommandError):
+    if isinstance(error, discord.app_commands.CheckFailure):
+        text = "❌ You don't have permission to use this command."
+    else:
+        text = "❌ Something went wrong. Please try again."
+        name = interaction.command.qualified_name if interaction.command else '?'
+        print(f"Command error in /{name}: {str(error)}")
+    try:
+        if interaction.response.is_done():
+            await interaction.followup.send(text, ephemeral=True)
+        else:
+            await interaction.response.send_message(text, ephemeral=True)
+    except discord.HTTPException:
+        pass
 
 
 @bot.event 
@@ -1818,623 +1971,37 @@ async def on_interaction_error(interaction: discord.Interaction, error: Exceptio
     except Exception as e:
         print(f"Error handling interaction error: {str(e)}")
 
-@bot.event
-async def on_ready():
-    """Auto syncs commands and initializes all commands on startup."""
-    try:
-        print("🔥 Sweet Holes VIP & Flirty Fun Bot is LIVE! 😏")
-
-        # Delete previous messages in specific channels
-        channels_to_clean = [
-            1337692528509456414,  # menu channel
-            1337508683286052899,  # order channel
-            1337508683684384846,  # tier channel
-            1337508682950377480,  # membership channel
-            1337644894558097408,  # complaints channel
-            1337508683286052895,  # suggestions channel
-            1337705856061407283,  # vendor channel
-            1337508683684384847   # redeem channel
-        ]
-
-        for channel_id in channels_to_clean:
-            channel = bot.get_channel(channel_id)
-            if channel:
-                try:
-                    async for message in channel.history(limit=100):
-                        if message.author == bot.user:
-                            await message.delete()
-                except Exception as e:
-                    print(f"Error cleaning channel {channel_id}: {str(e)}")
 
-        # Sync commands
-        await bot.tree.sync()
+async def sync_commands(force=False):
+    """Syncs the command tree if its definitions changed since last time."""
+    if await sync_if_changed(bot.tree, db, force=force):
+        print("✅ Slash commands synced")
+    else:
+        print("✅ Slash commands unchanged, sync skipped")
 
-        # Start loyalty update task
-        update_loyalty.start()
 
-        # Initialize channels
-        channels = {
-            'apply': bot.get_channel(1337508683286052894),
-            'response': bot.get_channel(1337645313279791174),
-            'menu': bot.get_channel(1337692528509456414),
-            'order': bot.get_channel(1337508683286052899),
-            'tier': bot.get_channel(1337508683684384846),
-            'membership': bot.get_channel(1337508682950377480),
-            'vip': bot.get_channel(1337508682950377480),
-            'job': bot.get_channel(1337508683286052894),
-            'redeem': bot.get_channel(1337508683684384847),
-            'vendor': bot.get_channel(1337705856061407283),
-            'complaints': bot.get_channel(1337644894558097408),
-            'suggestions': bot.get_channel(1337508683286052895)
-        }
-
-        # Setup database
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
-
-        # Create required tables
-        c.execute('''CREATE TABLE IF NOT EXISTS orders 
-                     (order_id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, 
-                      item TEXT, quantity INTEGER, status TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)'''
-                  )
-
-        c.execute('''CREATE TABLE IF NOT EXISTS rewards
-                     (user_id INTEGER PRIMARY KEY, points INTEGER DEFAULT 0,
-                      loyalty_tier TEXT DEFAULT 'Flirty Bronze', last_daily TIMESTAMP, username TEXT)'''
-                  )
-
-        c.execute('''CREATE TABLE IF NOT EXISTS feedback
-                     (feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      user_id INTEGER, rating INTEGER, comment TEXT)''')
-
-        c.execute('''CREATE TABLE IF NOT EXISTS complaints
-                     (complaint_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      user_id INTEGER, complaint TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)'''
-                  )
-
-        c.execute('''CREATE TABLE IF NOT EXISTS suggestions
-                     (suggestion_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      user_id INTEGER, suggestion TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)'''
-                  )
-
-        c.execute('''CREATE TABLE IF NOT EXISTS vendor_rewards
-                     (reward_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      vendor_id INTEGER, reward_name TEXT, points_cost INTEGER, description TEXT)'''
-                  )
-
-        conn.commit()
-        conn.close()
-
-        # Setup channel interfaces
-        for channel_name, channel in channels.items():
-            if channel:
-                if channel_name == 'menu':
-                    menu_channel = bot.get_channel(1337692528509456414)
-                    if menu_channel:
-                        embed = discord.Embed(
-                            title="🎀 Sweet Holes Interactive Menu 🎀",
-                            description="Click the buttons below to interact!",
-                            color=discord.Color.pink())
-                        menu_view = MenuView()
-                        await menu_channel.send(embed=embed, view=menu_view)
-                        print("✅ Menu button setup complete")
-
-                elif channel_name == 'order':
-                    embed = discord.Embed(
-                        title="🍩 Sweet Holes Order System 🍩",
-                        description="What can we get for you today, sugar? 😘",
-                        color=discord.Color.pink())
-                    await channel.send(embed=embed, view=OrderView())
-
-                elif channel_name == 'tier':
-                    embed = discord.Embed(
-                        title="💖 Check Your VIP Status 💖",
-                        description=
-                        "Click the button below to check your tier and points!",
-                        color=discord.Color.pink())
-                    view = discord.ui.View()
-                    check_tier_button = discord.ui.Button(
-                        label="💝 Check My Tier",
-                        style=discord.ButtonStyle.blurple)
-
-                    async def check_tier_callback(
-                            interaction: discord.Interaction):
-                        if interaction.channel_id != 1337508683684384846:
-                            await interaction.response.send_message(
-                                "❌ This command can only be used in the check tier channel!",
-                                ephemeral=True)
-                            return
-
-                        user_id = interaction.user.id
-                        conn = sqlite3.connect('orders.db')
-                        c = conn.cursor()
-                        c.execute(
-                            "SELECT loyalty_tier, points FROM rewards WHERE user_id = ?",
-                            (user_id, ))
-                        result = c.fetchone()
-                        conn.close()
-
-                        tier, points = result if result else ("Flirty Bronze",
-                                                              0)
-                        embed = discord.Embed(
-                            title="💖 Your VIP Sweet Holes Card 💖",
-                            description=
-                            f"👤 **{interaction.user.display_name}**\n🏅 **Tier:** {tier}\n🎁 **Points:** {points}",
-                            color=discord.Color.pink())
-                        await interaction.response.send_message(embed=embed,
-                                                                ephemeral=True)
-
-                    check_tier_button.callback = check_tier_callback
-                    view.add_item(check_tier_button)
-                    await channel.send(embed=embed, view=view)
-
-                elif channel_name == 'vip':
-                    embed = discord.Embed(
-                        title="💎 SWEET HOLES VIP MEMBERSHIP 💎",
-                        description=
-                        "Join our exclusive VIP program and unlock special perks!",
-                        color=discord.Color.gold())
-                    view = discord.ui.View()
-                    vip_button = discord.ui.Button(
-                        label="🌟 Apply for VIP",
-                        style=discord.ButtonStyle.danger)
-
-                    async def vip_callback(interaction: discord.Interaction):
-                        if interaction.channel_id != 1337508682950377480:
-                            await interaction.response.send_message(
-                                "❌ Wrong channel!", ephemeral=True)
-                            return
-                        response_channel = channels['response']
-                        modal = ApplicationModal(response_channel)
-                        await interaction.response.send_modal(modal)
-
-                    vip_button.callback = vip_callback
-                    view.add_item(vip_button)
-                    await channel.send(embed=embed, view=view)
-
-                elif channel_name == 'job':
-                    embed = discord.Embed(
-                        title="💼 SWEET HOLES EMPLOYMENT 💼",
-                        description=
-                        "Join our amazing team! Click below to apply.",
-                        color=discord.Color.blue())
-                    view = discord.ui.View()
-                    job_button = discord.ui.Button(
-                        label="📝 Apply Now", style=discord.ButtonStyle.primary)
-
-                    async def job_callback(interaction: discord.Interaction):
-                        if interaction.channel_id != 1337508683286052894:
-                            await interaction.response.send_message(
-                                "❌ Wrong channel!", ephemeral=True)
-                            return
-                        response_channel = channels['response']
-                        modal = ApplicationModal(response_channel)
-                        await interaction.response.send_modal(modal)
-
-                    job_button.callback = job_callback
-                    view.add_item(job_button)
-                    await channel.send(embed=embed, view=view)
-
-                elif channel_name == 'redeem':
-                    embed = discord.Embed(
-                        title="🎁 Sweet Holes Rewards Redemption",
-                        description="Click below to redeem your reward points!",
-                        color=discord.Color.gold())
-                    view = discord.ui.View()
-                    redeem_button = discord.ui.Button(
-                        label="🎁 Redeem Points",
-                        style=discord.ButtonStyle.success)
-
-                    async def redeem_callback(
-                            interaction: discord.Interaction):
-                        if interaction.channel_id != 1337508683684384847:
-                            await interaction.response.send_message(
-                                "❌ Wrong channel!", ephemeral=True)
-                            return
-                        conn = sqlite3.connect('orders.db')
-                        c = conn.cursor()
-                        c.execute(
-                            "SELECT points FROM rewards WHERE user_id = ?",
-                            (interaction.user.id, ))
-                        result = c.fetchone()
-                        points = result[0] if result else 0
-                        conn.close()
-
-                        embed = discord.Embed(
-                            title="🎁 Sweet Holes Rewards Redemption",
-                            description=
-                            f"You have **{points}** points available!\nChoose a reward to redeem:",
-                            color=discord.Color.gold())
-                        view = RedeemView(points)
-                        await interaction.response.send_message(embed=embed,
-                                                                view=view,
-                                                                ephemeral=True)
-
-                    redeem_button.callback = redeem_callback
-                    view.add_item(redeem_button)
-                    await channel.send(embed=embed, view=view)
-
-                elif channel_name == 'vendor':
-                    # Initialize vendor management in the specified channel
-                    vendor_management_channel = bot.get_channel(
-                        1337709954336952391)
-                    if vendor_management_channel:
-                        pass  # Keep existing messages
-                        embed = discord.Embed(
-                            title="🏪 Vendor Reward Management",
-                            description=
-                            "Click below to manage your vendor rewards!",
-                            color=discord.Color.blue())
-
-                        view = discord.ui.View(
-                            timeout=None)  # Make the view persistent
-
-
-
-                elif channel_name == 'complaints':
-                    # Messages are preserved
-                    embed = discord.Embed(
-                        title="📝 File a Complaint",
-                        description="Having an issue? Let us know below.",
-                        color=discord.Color.red())
-                    complaint_view = ComplaintView()
-                    await channel.send(embed=embed, view=complaint_view)
-
-                elif channel_name == 'suggestions':
-                    suggestions_channel = bot.get_channel(1337508683286052895)
-                    if suggestions_channel:
-                        try:
-                            embed = discord.Embed(
-                                title="💡 Make a Suggestion",
-                                description=
-                                "Have an idea to make Sweet Holes even better? Share it with us!",
-                                color=discord.Color.green())
-
-                            class SuggestionView(discord.ui.View):
-
-                                def __init__(self):
-                                    super().__init__(timeout=None)
-
-                                @discord.ui.button(
-                                    label="💡 Make Suggestion",
-                                    style=discord.ButtonStyle.success,
-                                    custom_id="suggestion_button")
-                                async def suggest_button(
-                                        self, interaction: discord.Interaction,
-                                        button: discord.ui.Button):
-                                    if interaction.channel_id != 1337508683286052895:
-                                        await interaction.response.send_message(
-                                            "❌ Please use this in the suggestions channel!",
-                                            ephemeral=True)
-                                        return
-                                    modal = SuggestionModal()
-                                    await interaction.response.send_modal(modal
-                                                                          )
-
-                            view = SuggestionView()
-                            await suggestions_channel.send(embed=embed,
-                                                           view=view)
-                            print("✅ Suggestions button setup complete")
-                        except Exception as e:
-                            print(
-                                f"❌ Error setting up suggestions button: {e}")
-
-    except Exception as e:
-        print(f"❌ Startup Error: {str(e)}")
-
-        async def redeem(interaction: discord.Interaction):
-            if interaction.channel_id != 1337508683684384847:
-                await interaction.response.send_message(
-                    "❌ This command can only be used in the rewards redemption channel!",
-                    ephemeral=True)
-                return
-            await process_redemption(interaction)
-
-        @bot.tree.command(
-            name="vendor_add",
-            description="Add vendor rewards to the redemption system")
-        async def vendor_add(interaction: discord.Interaction):
-            if not any(role.name == "Partner"
-                       for role in interaction.user.roles):
-                await interaction.response.send_message(
-                    "❌ You need the Partner role to use this command!",
-                    ephemeral=True)
-                return
-            await show_vendor_add_menu(interaction)
-
-        @bot.tree.command(name="add_points",
-                          description="Add points to a user")
-        @is_admin()
-        async def add_points(interaction: discord.Interaction,
-                             user: discord.Member, points: int):
-            await process_add_points(interaction, user, points)
-
-        @bot.tree.command(name="remove_points",
-                          description="Remove points from a user")
-        @is_admin()
-        async def remove_points(interaction: discord.Interaction,
-                                user: discord.Member, points: int):
-            await process_remove_points(interaction, user, points)
-
-        @bot.tree.command(name="remove_vendor_reward",
-                          description="Remove a vendor reward")
-        @is_admin()
-        async def remove_vendor_reward(interaction: discord.Interaction):
-            if interaction.channel_id != 1337709954336952391:
-                await interaction.response.send_message(
-                    "❌ This command can only be used in the vendor management channel!",
-                    ephemeral=True)
-                return
-            await process_remove_vendor_reward(interaction)
-
-        @bot.tree.command(name="update_loyalty",
-                          description="Manually update customer loyalty tiers")
-        @is_admin()
-        async def manual_update_loyalty(interaction: discord.Interaction):
-            await process_loyalty_update(interaction)
-
-        @bot.tree.command(name="vip_apply",
-                          description="Apply for Sweet Holes VIP Membership")
-        async def vip_apply(interaction: discord.Interaction):
-            if interaction.channel_id != 1337508682950377480:
-                await interaction.response.send_message(
-                    "❌ This command can only be used in the VIP membership channel!",
-                    ephemeral=True)
-                return
-            await process_vip_application(interaction)
-
-        # Verify database integrity
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
-
-        # Ensure all tables exist with correct schema
-        c.execute('''CREATE TABLE IF NOT EXISTS orders 
-                     (order_id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, 
-                      item TEXT, quantity INTEGER, status TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)'''
-                  )
-
-        c.execute('''CREATE TABLE IF NOT EXISTS rewards
-                     (user_id INTEGER PRIMARY KEY, points INTEGER DEFAULT 0,
-                      loyalty_tier TEXT DEFAULT 'Flirty Bronze', last_daily TIMESTAMP, username TEXT)'''
-                  )
-
-        c.execute('''CREATE TABLE IF NOT EXISTS feedback
-                     (feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      user_id INTEGER, rating INTEGER, comment TEXT)''')
-
-        c.execute('''CREATE TABLE IF NOT EXISTS complaints
-                     (complaint_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      user_id INTEGER, complaint TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)'''
-                  )
-
-        c.execute('''CREATE TABLE IF NOT EXISTS suggestions
-                     (suggestion_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      user_id INTEGER, suggestion TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)'''
-                  )
-
-        c.execute('''CREATE TABLE IF NOT EXISTS vendor_rewards
-                     (reward_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      vendor_id INTEGER, reward_name TEXT, points_cost INTEGER, description TEXT)'''
-                  )
-
-        conn.commit()
-        conn.close()
-
-        await bot.tree.sync()
-        update_loyalty.start()
-        print("🔥 Sweet Holes VIP & Flirty Fun Bot is LIVE! 😏")
-
-        # Channel IDs
-        apply_channel = bot.get_channel(1337508683286052894)
-        response_channel = bot.get_channel(1337645313279791174)
-        menu_channel = bot.get_channel(1337692528509456414)
-        order_channel = bot.get_channel(1337508683286052899)
-        tier_channel = bot.get_channel(1337508683684384846)
-        membership_channel = bot.get_channel(1337508682950377480)
-        complaints_channel = bot.get_channel(1337644894558097408)
-        suggestion_channel = bot.get_channel(1337508683286052895)
-        vendor_channel = bot.get_channel(1337705856061407283)
-        vendor_management_channel = bot.get_channel(1337709954336952391)
-        redeem_channel = bot.get_channel(1337508683684384847)
-
-        # Set up VIP application button in membership channel
-        if membership_channel:
-            embed = discord.Embed(
-                title="💎 SWEET HOLES VIP MEMBERSHIP 💎",
-                description=
-                "Click below to instantly become a VIP member!",
-                color=discord.Color.gold())
-            view = discord.ui.View()
-
-            async def apply_callback(interaction: discord.Interaction):
-                try:
-                    await interaction.response.defer(ephemeral=True)
-                    
-                    # Get the VIP role
-                    vip_role = interaction.guild.get_role(1337508682417700961)
-                    
-                    if not vip_role:
-                        await interaction.followup.send("❌ VIP role not found. Please contact an admin.", ephemeral=True)
-                        return
-
-                    if vip_role in interaction.user.roles:
-                        await interaction.followup.send("You are already a VIP member! 💖", ephemeral=True)
-                        return
-
-                    await interaction.user.add_roles(vip_role)
-                    await interaction.followup.send("✅ Welcome to Sweet Holes VIP! Your role has been assigned! 🎉", ephemeral=True)
-                    
-                    # Send notification to VIP channel
-                    vip_channel = interaction.client.get_channel(1337646191994867772)
-                    if vip_channel:
-                        welcome_embed = discord.Embed(
-                            title="🎉 New VIP Member!",
-                            description=f"Welcome {interaction.user.mention} to Sweet Holes VIP!",
-                            color=discord.Color.gold())
-                        await vip_channel.send(embed=welcome_embed)
-
-                except Exception as e:
-                    print(f"VIP role error: {str(e)}")
-                    await interaction.followup.send("❌ Failed to assign VIP role. Please try again.", ephemeral=True)
-
-            apply_button = discord.ui.Button(label="🌟 Join VIP",
-                                             style=discord.ButtonStyle.danger)
-            apply_button.callback = apply_callback
-            view.add_item(apply_button)
-            await membership_channel.send(embed=embed, view=view)
-
-        # Channels are no longer purged to preserve message history
-
-        if menu_channel:
-            embed = discord.Embed(
-                title="🎀 Sweet Holes Interactive Menu 🎀",
-                description="Click the buttons below to interact!",
-                color=discord.Color.pink())
-            await menu_channel.send(embed=embed, view=MenuView())
-
-        if order_channel:
-            embed = discord.Embed(
-                title="🍩 Sweet Holes Order System 🍩",
-                description="What can we get for you today, sugar? 😘",
-                color=discord.Color.pink())
-            await order_channel.send(embed=embed, view=OrderView())
-
-        if tier_channel:
-            embed = discord.Embed(
-                title="💖 Check Your VIP Status 💖",
-                description="Use `/my_tier` to check your tier and points!",
-                color=discord.Color.pink())
-            await tier_channel.send(embed=embed)
-
-        if membership_channel:
-            embed = discord.Embed(
-                title="💎 Sweet Holes Membership",
-                description="Welcome to our exclusive membership area!",
-                color=discord.Color.gold())
-            await membership_channel.send(embed=embed)
-
-        if complaints_channel:
-            embed = discord.Embed(
-                title="📝 File a Complaint",
-                description="Having an issue? Let us know below.",
-                color=discord.Color.red())
-            await complaints_channel.send(embed=embed, view=ComplaintView())
-
-        if suggestion_channel:
-            embed = discord.Embed(
-                title="💡 Make a Suggestion",
-                description=
-                "Have an idea to make Sweet Holes even better? Click below!",
-                color=discord.Color.green())
-            view = discord.ui.View(timeout=None)  # Make view persistent
-            suggest_button = discord.ui.Button(
-                label="💡 Make Suggestion", style=discord.ButtonStyle.success)
-
-            async def suggest_callback(interaction: discord.Interaction):
-                if interaction.channel_id != 1337508683286052895:
-                    await interaction.response.send_message("❌ Wrong channel!",
-                                                            ephemeral=True)
-                    return
-                modal = SuggestionModal()
-                await interaction.response.send_modal(modal)
-
-            suggest_button.callback = suggest_callback
-            view.add_item(suggest_button)
-            await suggestion_channel.send(embed=embed, view=view)
-
-        if vendor_channel:
-            embed = discord.Embed(
-                title="🏪 Vendor Reward Management",
-                description="Click below to add or manage your vendor rewards!",
-                color=discord.Color.blue())
-            view = discord.ui.View()
-            add_button = discord.ui.Button(label="➕ Add Reward",
-                                           style=discord.ButtonStyle.primary)
-            remove_button = discord.ui.Button(label="🗑️ Remove Reward",
-                                              style=discord.ButtonStyle.danger)
-
-            async def remove_callback(interaction: discord.Interaction):
-                if interaction.channel.id != 1337705856061407283:
-                    await interaction.response.send_message("❌ Wrong channel!",
-                                                            ephemeral=True)
-                    return
-                if not any(role.name == "Partner"
-                           for role in interaction.user.roles):
-                    await interaction.response.send_message(
-                        "❌ You need the Partner role to use this!",
-                        ephemeral=True)
-                    return
-                modal = RemoveVendorRewardModal()
-                await interaction.response.send_modal(modal)
-
-            async def vendor_callback(interaction: discord.Interaction):
-                if interaction.channel.id != 1337705856061407283:
-                    await interaction.response.send_message("❌ Wrong channel!",
-                                                            ephemeral=True)
-                    return
-                await vendor_add(interaction)
-
-            add_button.callback = vendor_callback
-            remove_button.callback = remove_callback
-            view.add_item(add_button)
-            view.add_item(remove_button)
-            await vendor_channel.send(embed=embed, view=view)
+@bot.event
+async def on_ready():
+    """Runs the startup steps once; reconnects only log."""
+    if startup.started:
+        print("🔁 Reconnected to Discord")
+        return
 
-        if redeem_channel:
-            embed = discord.Embed(
-                title="🎁 Sweet Holes Rewards Redemption",
-                description="Click below to redeem your reward points!",
-                color=discord.Color.gold())
-            view = discord.ui.View()
-            redeem_button = discord.ui.Button(
-                label="🎁 Redeem Points", style=discord.ButtonStyle.success)
-
-            async def redeem_callback(interaction: discord.Interaction):
-                if interaction.channel_id != 1337508683684384847:
-                    await interaction.response.send_message("❌ Wrong channel!",
-                                                            ephemeral=True)
-                    return
+    print("🔥 Sweet Holes VIP & Flirty Fun Bot is LIVE! 😏")
 
-                # Get user points
-                conn = sqlite3.connect('orders.db')
-                c = conn.cursor()
-                c.execute("SELECT points FROM rewards WHERE user_id = ?",
-                          (interaction.user.id, ))
-                result = c.fetchone()
-                points = result[0] if result else 0
-                conn.close()
+    # Independent steps run concurrently
+    startup.step('command_sync', sync_commands)
+    startup.step('vendor_catalog', vendor_catalog.load)
+    for key, channel_id, embed, view in channel_panels():
+        channel = bot.get_channel(channel_id)
+        if channel:
+            startup.step(f'panel_{key}', publish_panel, key, channel, embed,
+                         view)
 
-                embed = discord.Embed(
-                    title="🎁 Sweet Holes Rewards Redemption",
-                    description=
-                    f"You have **{points}** points available!\nChoose a reward to redeem:",
-                    color=discord.Color.gold())
-
-                view = RedeemView(points)
-                await interaction.response.send_message(embed=embed,
-                                                        view=view,
-                                                        ephemeral=True)
-
-            redeem_button.callback = redeem_callback
-            view.add_item(redeem_button)
-            await redeem_channel.send(embed=embed, view=view)
-
-        # Verify database tables
-        conn = sqlite3.connect('orders.db')
-        c = conn.cursor()
-        tables = [
-            'orders', 'rewards', 'feedback', 'complaints', 'suggestions',
-            'vendor_rewards'
-        ]
-        for table in tables:
-            c.execute(
-                f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table}'"
-            )
-            if not c.fetchone():
-                print(f"⚠️ Warning: Table '{table}' not found!")
-        conn.close()
-    except Exception as e:
-        print(f"❌ Startup Error: {str(e)}")
+    await startup.run()
+    slowest = ", ".join(f"{name} {seconds * 1000:.0f} ms"
+                        for name, seconds in startup.slowest())
+    print(f"✅ Ready in {startup.ready_seconds:.2f}s (slowest: {slowest})")
 
 
 # Import and start the keep_alive server first
@@ -2471,4 +2038,6 @@ except discord.PrivilegedIntentsRequired:
     exit(1)
 except Exception as e:
     print(f"❌ Failed to start bot: {str(e)}")
-    exit(1)
\ No newline at end of file
+    exit(1)
+finally:
+    db.close()
\ No newline at end of file
@@ -0,0 +1,181 @@
+import asyncio
+from bisect import bisect_left, insort
+
+
+def _names(member):
+    names = {member.name.lower(), member.display_name.lower()}
+    if member.nick:
+        names.add(member.nick.lower())
+    return names
+
+
+def _grams(text):
+    # Bigrams and trigrams for substring lookups
+    grams = set()
+    for n in (2, 3):
+        grams.update(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams
+
+
+class _GuildIndex:
+
+    def __init__(self):
+        self.names = {}  # member_id -> set of lower-cased names
+        self.exact = {}  # name -> set of member_ids
+        self.grams = {}  # bigram/trigram -> set of member_ids
+        self.sorted = []  # sorted (name, member_id) for prefix search
+
+    @classmethod
+    def build(cls, entries):
+        """Index ``(member_id, names)`` pairs, sorting names once."""
+        index = cls()
+        for member_id, names in entries:
+            index.names[member_id] = names
+            for name in names:
+                index.exact.setdefault(name, set()).add(member_id)
+                for gram in _grams(name):
+                    index.grams.setdefault(gram, set()).add(member_id)
+                index.sorted.append((name, member_id))
+        index.sorted.sort()
+        return index
+
+    def add(self, member_id, names):
+        self.names[member_id] = names
+        for name in names:
+            self.exact.setdefault(name, set()).add(member_id)
+            for gram in _grams(name):
+                self.grams.setdefault(gram, set()).add(member_id)
+            insort(self.sorted, (name, member_id))
+
+    def remove(self, member_id):
+        names = self.names.pop(member_id, ())
+        for name in names:
+            ids = self.exact.get(name)
+            if ids:
+                ids.discard(member_id)
+                if not ids:
+                    del self.exact[name]
+            for gram in _grams(name):
+                ids = self.grams.get(gram)
+                if ids:
+                    ids.discard(member_id)
+                    if not ids:
+                        del self.grams[gram]
+            i = bisect_left(self.sorted, (name, member_id))
+            if i < len(self.sorted) and self.sorted[i] == (name, member_id):
+                del self.sorted[i]
+
+    def prefix(self, query, limit):
+        found = []
+        i = bisect_left(self.sorted, (query, ))
+        while i < len(self.sorted) and len(found) < limit:
+            name, member_id = self.sorted[i]
+            if not name.startswith(query):
+                break
+            if member_id not in found:
+                found.append(member_id)
+            i += 1
+        return found
+
+    def substring(self, query, limit):
+        if len(query) < 2:
+            return self.prefix(query, limit)
+        grams = sorted((self.grams.get(gram, set()) for gram in _grams(query)),
+                       key=len)
+        candidates = set.intersection(*grams) if grams else set()
+        found = self.prefix(query, limit)
+        for member_id in sorted(candidates):
+            if len(found) >= limit:
+                break
+            if member_id not in found and any(
+                    query in name for name in self.names[member_id]):
+                found.append(member_id)
+        return found
+
+
+class MemberIndex:
+    """Per-guild index of member names, nicknames and display names.
+
+    Built once per guild when it becomes available (:meth:`build`) and
+    kept current from the member join/remove/update events. Exact lookups are a dict hit, prefix search
+    is a bisect over sorted names and substring search intersects
+    bigram/trigram posting sets instead of scanning ``guild.members``.
+    """
+
+    def __init__(self):
+        self._guilds = {}
+
+    def _index(self, guild):
+        index = self._guilds.get(guild.id)
+        if index is None:
+            # Not built yet; do it inline rather than fail the lookup
+            index = _GuildIndex.build(
+                [(member.id, _names(member)) for member in guild.members])
+            self._guilds[guild.id] = index
+        return index
+
+    async def build(self, guild):
+        """Index a guild's members off the event loop.
+
+        Names are snapshotted on the loop; the index itself is built in a
+        worker thread. Members who joined or left meanwhile are caught up
+        before the index is installed.
+        """
+        if guild.id in self._guilds:
+            return
+        entries = [(member.id, _names(member)) for member in guild.members]
+        index = await asyncio.to_thread(_GuildIndex.build, entries)
+        if guild.id in self._guilds:
+            return  # a lookup built it inline meanwhile
+        current = {member.id: member for member in guild.members}
+        for member_id in set(index.names) - current.keys():
+            index.remove(member_id)
+        for member_id in current.keys() - index.names.keys():
+            index.add(member_id, _names(current[member_id]))
+        self._guilds[guild.id] = index
+
+    def add(self, member):
+        if member.guild.id in self._guilds:
+            index = self._guilds[member.guild.id]
+            index.remove(member.id)
+            index.add(member.id, _names(member))
+
+    def remove(self, member):
+        if member.guild.id in self._guilds:
+            self._guilds[member.guild.id].remove(member.id)
+
+    def update(self, before, after):
+        if _names(before) != _names(after):
+            self.add(after)
+
+    def exact(self, guild, query):
+        """Members whose name, display name or nick equals ``query``."""
+        ids = self._index(guild).exact.get(query.lower().strip(), ())
+        return [m for m in map(guild.get_member, sorted(ids)) if m]
+
+    def search(self, guild, query, limit=25):
+        """Members with a name containing ``query``, prefix matches first."""
+        ids = self._index(guild).substring(query.lower().strip(), limit)
+        return [m for m in map(guild.get_member, ids) if m]
+
+    def resolve(self, guild, query, limit=10):
+        """Find a member from an ID, exact name or partial name.
+
+        Returns ``(member, matches)``: ``member`` is set when the query is
+        unambiguous, otherwise ``matches`` lists up to ``limit`` candidates
+        (empty if nothing matched).
+        """
+        query = query.lower().strip()
+        if query.isdigit():
+            member = guild.get_member(int(query))
+            if member:
+                return member, []
+
+        exact = self.exact(guild, query)
+        if exact:
+            return exact[0], []
+
+        matches = self.search(guild, query, limit)
+        if len(matches) == 1:
+            return matches[0], []
+        return None, matches
@@ -0,0 +1,186 @@
+import functools
+import re
+import time
+from bisect import bisect_left
+
+import discord
+from discord import app_commands
+
+# Latency histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Handler:
+    __slots__ = ('buckets', 'total', 'errors', 'in_flight')
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+        self.total = 0.0
+        self.errors = 0
+        self.in_flight = 0
+
+
+class _Track:
+    __slots__ = ('handler', 'started')
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def __enter__(self):
+        self.handler.in_flight += 1
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        handler = self.handler
+        handler.in_flight -= 1
+        handler.buckets[bisect_left(BUCKETS, elapsed)] += 1
+        handler.total += elapsed
+        if exc_type is not None:
+            handler.errors += 1
+        return False
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """Per-handler latency histograms, error counts and in-flight gauges.
+
+    Updated only from the event loop thread, so recording takes no locks;
+    :meth:`render` (called from the keep-alive server thread) reads
+    snapshot copies and may be a call or two behind.
+    """
+
+    def __init__(self):
+        self._handlers = {}
+
+    def _handler(self, name):
+        handler = self._handlers.get(name)
+        if handler is None:
+            handler = self._handlers[name] = _Handler()
+        return handler
+
+    def track(self, name):
+        """Context manager timing one call of handler ``name``."""
+        return _Track(self._handler(name))
+
+    def error(self, name):
+        self._handler(name).errors += 1
+
+    def wrap(self, name, fn):
+        """Wrap coroutine function ``fn`` so every call is tracked."""
+
+        @functools.wraps(fn)
+        async def tracked(*args, **kwargs):
+            with self.track(name):
+                return await fn(*args, **kwargs)
+
+        return tracked
+
+    def render(self):
+        """All handlers in Prometheus text exposition format."""
+        handlers = sorted(list(self._handlers.items()))
+        lines = [
+            "# HELP bot_handler_latency_seconds Time spent in interaction handlers.",
+            "# TYPE bot_handler_latency_seconds histogram",
+        ]
+        for name, handler in handlers:
+            label = _label(name)
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ('+Inf', ),
+                                    list(handler.buckets)):
+                cumulative += count
+                lines.append(
+                    f'bot_handler_latency_seconds_bucket{{handler="{label}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'bot_handler_latency_seconds_sum{{handler="{label}"}} {handler.total}')
+            lines.append(
+                f'bot_handler_latency_seconds_count{{handler="{label}"}} {cumulative}')
+
+        lines += [
+            "# HELP bot_handler_errors_total Handler calls that raised.",
+            "# TYPE bot_handler_errors_total counter",
+        ]
+        lines += [
+            f'bot_handler_errors_total{{handler="{_label(name)}"}} {handler.errors}'
+            for name, handler in handlers
+        ]
+        lines += [
+            "# HELP bot_handler_in_flight Handler calls currently running.",
+            "# TYPE bot_handler_in_flight gauge",
+        ]
+        lines += [
+            f'bot_handler_in_flight{{handler="{_label(name)}"}} {handler.in_flight}'
+            for name, handler in handlers
+        ]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+_TRAILING_ID = re.compile(r'\d+$')
+
+
+def _item_name(view, item):
+    if getattr(item, '_provided_custom_id', False):
+        # Per-reward buttons share one series (claim_vendor_12 -> claim_vendor_*)
+        key = _TRAILING_ID.sub('*', item.custom_id)
+    else:
+        # Generated custom_ids are random per view; name the callback instead
+        callback = getattr(item.callback, 'callback', item.callback)
+        key = getattr(callback, '__name__', None)
+        if key in (None, 'callback'):
+            position = view.children.index(item) if item in view.children else ''
+            key = f"{type(item).__name__}{position}"
+    return f"view:{type(view).__name__}.{key}"
+
+
+def instrument_commands(tree):
+    """Track every slash command currently registered on ``tree``."""
+    for command in tree.walk_commands():
+        if isinstance(command, app_commands.Command) and not getattr(
+                command._callback, '__wrapped__', None):
+            command._callback = metrics.wrap(
+                f"command:{command.qualified_name}", command._callback)
+
+
+def instrument_ui():
+    """Track every View button/select callback and Modal submission.
+
+    discord.py has no public after-callback hook, so this wraps the
+    dispatch task on the base classes. Errors are counted from the base
+    ``on_error`` hooks, since dispatch swallows them.
+    """
+    if getattr(discord.ui.View, '_metrics_instrumented', False):
+        return
+    view_task = discord.ui.View._scheduled_task
+    view_error = discord.ui.View.on_error
+    modal_task = discord.ui.Modal._scheduled_task
+    modal_error = discord.ui.Modal.on_error
+
+    async def scheduled_view_task(self, item, interaction):
+        with metrics.track(_item_name(self, item)):
+            return await view_task(self, item, interaction)
+
+    async def on_view_error(self, interaction, error, item, /):
+        metrics.error(_item_name(self, item))
+        return await view_error(self, interaction, error, item)
+
+    async def scheduled_modal_task(self, interaction, *args):
+        with metrics.track(f"modal:{type(self).__name__}"):
+            return await modal_task(self, interaction, *args)
+
+    async def on_modal_error(self, interaction, error, /):
+        metrics.error(f"modal:{type(self).__name__}")
+        return await modal_error(self, interaction, error)
+
+    discord.ui.View._scheduled_task = scheduled_view_task
+    discord.ui.View.on_error = on_view_error
+    discord.ui.Modal._scheduled_task = scheduled_modal_task
+    discord.ui.Modal.on_error = on_modal_error
+    discord.ui.View._metrics_instrumented = True
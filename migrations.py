@@ -0,0 +1,294 @@
+import sqlite3
+
+
+def _baseline(c):
+    c.execute('''CREATE TABLE IF NOT EXISTS rewards
+                 (user_id INTEGER PRIMARY KEY,
+                  points INTEGER DEFAULT 0,
+                  loyalty_tier TEXT DEFAULT 'Flirty Bronze',
+                  last_daily TIMESTAMP,
+                  username TEXT)''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS git_pushes
+                 (push_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                  commit_hash TEXT,
+                  commit_message TEXT,
+                  status TEXT)''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS orders
+                 (order_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  user_id INTEGER, username TEXT, item TEXT, quantity INTEGER,
+                  status TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS feedback
+                 (feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  user_id INTEGER, username TEXT, rating INTEGER, comment TEXT)''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS complaints
+                 (complaint_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  user_id INTEGER, username TEXT, complaint TEXT,
+                  timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS suggestions
+                 (suggestion_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  user_id INTEGER, username TEXT, suggestion TEXT,
+                  timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS vendor_rewards
+                 (reward_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  vendor_id INTEGER, vendor_username TEXT, reward_name TEXT,
+                  points_cost INTEGER, description TEXT)''')
+
+
+def _add_missing_columns(c):
+    # Databases created by older startup code are missing some columns
+    columns = {
+        'orders': [('username', 'TEXT')],
+        'rewards': [('username', 'TEXT')],
+        'feedback': [('username', 'TEXT')],
+        'complaints': [('username', 'TEXT')],
+        'suggestions': [('username', 'TEXT')],
+        'vendor_rewards': [('vendor_username', 'TEXT')],
+    }
+    for table, wanted in columns.items():
+        existing = {row[1] for row in c.execute(f"PRAGMA table_info({table})")}
+        for name, kind in wanted:
+            if name not in existing:
+                c.execute(f"ALTER TABLE {table} ADD COLUMN {name} {kind}")
+
+
+def _indexes(c):
+    # Check Status: latest orders for one user
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_orders_user
+                 ON orders (user_id, order_id DESC)''')
+    # Reporting on reward balances
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_rewards_points
+                 ON rewards (points)''')
+
+
+def _points_ledger(c):
+    c.execute('''CREATE TABLE IF NOT EXISTS points_ledger
+                 (entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  user_id INTEGER NOT NULL,
+                  delta INTEGER NOT NULL,
+                  source TEXT NOT NULL,
+                  reference TEXT,
+                  created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_points_ledger_user
+                 ON points_ledger (user_id)''')
+    # Seed the ledger so existing balances reconcile
+    c.execute('''INSERT INTO points_ledger (user_id, delta, source)
+                 SELECT user_id, points, 'opening_balance' FROM rewards
+                 WHERE points != 0''')
+
+
+def _job_state(c):
+    # Small key/value store for background job bookmarks
+    c.execute('''CREATE TABLE IF NOT EXISTS job_state
+                 (name TEXT PRIMARY KEY,
+                  value INTEGER)''')
+
+
+def _panel_messages(c):
+    # Message ids of the channel panels, so startup can edit instead of repost
+    c.execute('''CREATE TABLE IF NOT EXISTS panel_messages
+                 (panel TEXT PRIMARY KEY,
+                  channel_id INTEGER NOT NULL,
+                  message_id INTEGER NOT NULL,
+                  content_hash TEXT NOT NULL,
+                  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+
+
+def _command_sync(c):
+    # Hash of the last synced app command tree
+    c.execute('''CREATE TABLE IF NOT EXISTS command_sync
+                 (scope TEXT PRIMARY KEY,
+                  tree_hash TEXT NOT NULL,
+                  synced_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+
+
+def _outbox(c):
+    # Channel notifications waiting to be sent
+    c.execute('''CREATE TABLE IF NOT EXISTS outbox
+                 (message_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  channel_id INTEGER NOT NULL,
+                  payload TEXT NOT NULL,
+                  attempts INTEGER NOT NULL DEFAULT 0,
+                  next_attempt_at REAL NOT NULL,
+                  last_error TEXT,
+                  created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_outbox_due
+                 ON outbox (next_attempt_at)''')
+
+
+def _paging_indexes(c):
+    # Keyset pages filtered by status or user
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_orders_status
+                 ON orders (status, order_id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_feedback_user
+                 ON feedback (user_id, feedback_id)''')
+
+
+def _daily_stats(c):
+    # Per-day rollups kept current by triggers, for range reports
+    c.execute('''CREATE TABLE IF NOT EXISTS daily_stats
+                 (day TEXT PRIMARY KEY,
+                  orders INTEGER NOT NULL DEFAULT 0,
+                  items INTEGER NOT NULL DEFAULT 0,
+                  points_issued INTEGER NOT NULL DEFAULT 0,
+                  points_redeemed INTEGER NOT NULL DEFAULT 0,
+                  new_members INTEGER NOT NULL DEFAULT 0)''')
+
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_orders_rollup_insert
+                 AFTER INSERT ON orders
+                 BEGIN
+                     INSERT INTO daily_stats (day, orders, items)
+                     VALUES (date(NEW.timestamp), 1, COALESCE(NEW.quantity, 0))
+                     ON CONFLICT(day) DO UPDATE
+                     SET orders = orders + 1,
+                         items = items + excluded.items;
+                 END''')
+    # Cancelled orders are deleted; take them back out of their day
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_orders_rollup_delete
+                 AFTER DELETE ON orders
+                 BEGIN
+                     UPDATE daily_stats
+                     SET orders = orders - 1,
+                         items = items - COALESCE(OLD.quantity, 0)
+                     WHERE day = date(OLD.timestamp);
+                 END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_ledger_rollup
+                 AFTER INSERT ON points_ledger
+                 WHEN NEW.source != 'opening_balance'
+                 BEGIN
+                     INSERT INTO daily_stats (day, points_issued, points_redeemed)
+                     VALUES (date(NEW.created_at),
+                             MAX(NEW.delta, 0),
+                             CASE WHEN NEW.source IN ('redemption', 'vendor_claim')
+                                  THEN -NEW.delta ELSE 0 END)
+                     ON CONFLICT(day) DO UPDATE
+                     SET points_issued = points_issued + excluded.points_issued,
+                         points_redeemed = points_redeemed + excluded.points_redeemed;
+                 END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_rewards_rollup
+                 AFTER INSERT ON rewards
+                 BEGIN
+                     INSERT INTO daily_stats (day, new_members)
+                     VALUES (date('now'), 1)
+                     ON CONFLICT(day) DO UPDATE
+                     SET new_members = new_members + 1;
+                 END''')
+
+    # Backfill from history; members only from ledger welcome bonuses
+    c.execute('''INSERT INTO daily_stats (day, orders, items)
+                 SELECT date(timestamp), COUNT(*), COALESCE(SUM(quantity), 0)
+                 FROM orders GROUP BY date(timestamp)''')
+    c.execute('''INSERT INTO daily_stats (day, points_issued, points_redeemed, new_members)
+                 SELECT date(created_at),
+                        SUM(MAX(delta, 0)),
+                        -SUM(CASE WHEN source IN ('redemption', 'vendor_claim')
+                                  THEN delta ELSE 0 END),
+                        SUM(source = 'welcome_bonus')
+                 FROM points_ledger WHERE source != 'opening_balance'
+                 GROUP BY date(created_at)
+                 ON CONFLICT(day) DO UPDATE
+                 SET points_issued = excluded.points_issued,
+                     points_redeemed = excluded.points_redeemed,
+                     new_members = excluded.new_members''')
+
+
+def _member_rollup(c):
+    # "New members" means welcome bonuses, as in the backfill; the rewards
+    # trigger also counted rows created by chat and reaction points
+    c.execute('DROP TRIGGER IF EXISTS trg_rewards_rollup')
+    c.execute('DROP TRIGGER IF EXISTS trg_ledger_rollup')
+    c.execute('''CREATE TRIGGER trg_ledger_rollup
+                 AFTER INSERT ON points_ledger
+                 WHEN NEW.source != 'opening_balance'
+                 BEGIN
+                     INSERT INTO daily_stats (day, points_issued, points_redeemed,
+                                              new_members)
+                     VALUES (date(NEW.created_at),
+                             MAX(NEW.delta, 0),
+                             CASE WHEN NEW.source IN ('redemption', 'vendor_claim')
+                                  THEN -NEW.delta ELSE 0 END,
+                             NEW.source = 'welcome_bonus')
+                     ON CONFLICT(day) DO UPDATE
+                     SET points_issued = points_issued + excluded.points_issued,
+                         points_redeemed = points_redeemed + excluded.points_redeemed,
+                         new_members = new_members + excluded.new_members;
+                 END''')
+    c.execute('''UPDATE daily_stats SET new_members = COALESCE(
+                     (SELECT COUNT(*) FROM points_ledger
+                      WHERE source = 'welcome_bonus'
+                        AND date(created_at) = daily_stats.day), 0)''')
+
+
+# Ordered list of (version, description, function). Append only.
+MIGRATIONS = [
+    (1, "baseline schema", _baseline),
+    (2, "add columns missing from older schemas", _add_missing_columns),
+    (3, "indexes for hot queries", _indexes),
+    (4, "points ledger", _points_ledger),
+    (5, "background job state", _job_state),
+    (6, "channel panel registry", _panel_messages),
+    (7, "command sync state", _command_sync),
+    (8, "notification outbox", _outbox),
+    (9, "indexes for paged admin views", _paging_indexes),
+    (10, "daily rollups", _daily_stats),
+    (11, "count new members from welcome bonuses", _member_rollup),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    """Return the applied schema version (0 for a fresh database)."""
+    if not conn.execute("SELECT name FROM sqlite_master "
+                        "WHERE type='table' AND name='schema_version'"
+                        ).fetchone():
+        return 0
+    return conn.execute(
+        "SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(path):
+    """Bring the database at ``path`` up to the latest schema version.
+
+    Enables WAL once, then applies each pending migration in its own
+    transaction. Nothing else is executed when the schema is current.
+    """
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        if conn.execute("PRAGMA journal_mode").fetchone()[0] != 'wal':
+            conn.execute("PRAGMA journal_mode=WAL")
+
+        version = current_version(conn)
+        if version >= LATEST_VERSION:
+            return version
+
+        c = conn.cursor()
+        c.execute('''CREATE TABLE IF NOT EXISTS schema_version
+                     (version INTEGER PRIMARY KEY,
+                      description TEXT,
+                      applied_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+
+        for number, description, apply in MIGRATIONS:
+            if number <= version:
+                continue
+            c.execute('BEGIN IMMEDIATE')
+            try:
+                apply(c)
+                c.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (number, description))
+                c.execute('COMMIT')
+            except Exception:
+                c.execute('ROLLBACK')
+                raise
+            print(f"✅ Applied migration {number}: {description}")
+            version = number
+        return version
+    finally:
+        conn.close()
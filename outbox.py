@@ -0,0 +1,238 @@
+import asyncio
+import json
+import time
+
+import discord
+
+# Discord embed limits
+MAX_FIELDS = 25
+MAX_FIELD_NAME = 256
+MAX_FIELD_VALUE = 1024
+MAX_EMBED_CHARS = 6000
+
+
+class Outbox:
+    """Durable queue of channel notifications.
+
+    Handlers call :meth:`enqueue`, which only inserts an ``outbox`` row, and
+    carry on with their reply; :meth:`add` does the same inside a handler's
+    own transaction. A background drainer sends due rows oldest
+    first, at most one message per ``per_channel_seconds`` per channel.
+    Failed sends are retried with exponential backoff. Rows are deleted
+    only once sent (or given up on), so pending notifications survive a
+    restart.
+
+    Channels registered with :meth:`coalesce` hold notifications for a
+    short window; if more than ``threshold`` have piled up by then they go
+    out as one digest embed instead of one message each.
+    """
+
+    def __init__(self, database, client, per_channel_seconds=1.0,
+                 max_attempts=8, max_backoff=600, poll_seconds=30):
+        self.db = database
+        self.client = client
+        self.per_channel_seconds = per_channel_seconds
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self.poll_seconds = poll_seconds
+        self.sent = 0
+        self.retried = 0
+        self.dropped = 0
+        self.digests = 0
+        self.coalesced = 0  # messages saved by digests
+        self._coalesce = {}  # channel_id -> (window, threshold)
+        self._next_send = {}  # channel_id -> monotonic time
+        self._wake = asyncio.Event()
+        self._task = None
+
+    def coalesce(self, channel_id, window=10.0, threshold=3):
+        """Batch notifications for ``channel_id`` into digests."""
+        self._coalesce[channel_id] = (window, threshold)
+
+    def add(self, c, channel_id, embed):
+        """Insert ``embed`` for ``channel_id`` with cursor ``c``.
+
+        For use inside another :meth:`Database.transaction` so the event and
+        its notification commit together; call :meth:`wake` afterwards.
+        """
+        window = self._coalesce.get(channel_id, (0, 0))[0]
+        c.execute(
+            "INSERT INTO outbox (channel_id, payload, next_attempt_at) VALUES (?, ?, ?)",
+            (channel_id, json.dumps(embed.to_dict()), time.time() + window))
+
+    def wake(self):
+        """Have the drainer look for new rows now."""
+        self._wake.set()
+
+    async def enqueue(self, channel_id, embed):
+        """Queue ``embed`` for ``channel_id``; returns once it is stored."""
+        await self.db.transaction(self.add, channel_id, embed)
+        self.wake()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _retry(self, message_id, attempts, error):
+        attempts += 1
+        if attempts >= self.max_attempts:
+            await self._drop(message_id, error)
+            return
+        delay = min(2**attempts, self.max_backoff)
+        await self.db.execute(
+            """UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?
+               WHERE message_id = ?""",
+            (attempts, time.time() + delay, str(error), message_id))
+        self.retried += 1
+
+    async def _drop(self, message_id, error):
+        await self.db.execute("DELETE FROM outbox WHERE message_id = ?",
+                              (message_id, ))
+        self.dropped += 1
+        print(f"❌ Outbox dropped message {message_id}: {error}")
+
+    async def _send(self, message_id, channel_id, payload, attempts):
+        channel = self.client.get_channel(channel_id)
+        if channel is None:
+            await self._drop(message_id, f"channel {channel_id} not found")
+            return
+        try:
+            await channel.send(embed=discord.Embed.from_dict(
+                json.loads(payload)))
+        except (discord.Forbidden, discord.NotFound) as e:
+            await self._drop(message_id, e)
+            return
+        except (discord.HTTPException, OSError) as e:
+            await self._retry(message_id, attempts, e)
+            return
+        await self.db.execute("DELETE FROM outbox WHERE message_id = ?",
+                              (message_id, ))
+        self.sent += 1
+
+    async def _send_digest(self, channel_id, rows):
+        # Pack as many events as fit into one embed; the rest wait
+        embed = discord.Embed(color=discord.Color.gold())
+        used = 0
+        packed = []
+        for row in rows:
+            payload = json.loads(row[2])
+            name = (payload.get('title') or 'Notification')[:MAX_FIELD_NAME]
+            value = (payload.get('description') or '-')[:MAX_FIELD_VALUE]
+            if (len(packed) == MAX_FIELDS
+                    or used + len(name) + len(value) > MAX_EMBED_CHARS - 100):
+                break
+            embed.add_field(name=name, value=value, inline=False)
+            used += len(name) + len(value)
+            packed.append(row)
+        embed.title = f"🔔 {len(packed)} new notifications"
+        embed.timestamp = discord.utils.utcnow()
+
+        channel = self.client.get_channel(channel_id)
+        if channel is None:
+            for row in packed:
+                await self._drop(row[0], f"channel {channel_id} not found")
+            return
+        try:
+            await channel.send(embed=embed)
+        except (discord.HTTPException, OSError) as e:
+            # Fall back to sending (and retrying) each row on its own
+            for message_id, _, _, attempts in packed:
+                await self._retry(message_id, attempts, e)
+            return
+        await self.db.executemany("DELETE FROM outbox WHERE message_id = ?",
+                                  [(row[0], ) for row in packed])
+        self.digests += 1
+        self.sent += len(packed)
+        self.coalesced += len(packed) - 1
+
+    async def _drain_coalesced(self, channel_id, threshold):
+        # Every fresh row for the channel, including ones still in window
+        rows = await self.db.fetchall(
+            """SELECT message_id, channel_id, payload, attempts FROM outbox
+               WHERE channel_id = ? AND attempts = 0
+               ORDER BY message_id LIMIT ?""", (channel_id, MAX_FIELDS))
+        if len(rows) > threshold:
+            await self._send_digest(channel_id, rows)
+            return True
+        return False
+
+    async def drain(self, limit=50):
+        """Send every due message that its channel's rate allows.
+
+        Returns the seconds until the next message could go out, or None
+        if nothing is waiting.
+        """
+        rows = await self.db.fetchall(
+            """SELECT message_id, channel_id, payload, attempts FROM outbox
+               WHERE next_attempt_at <= ? ORDER BY message_id LIMIT ?""",
+            (time.time(), limit))
+
+        wait = None
+        blocked = set()
+        processed = 0
+        for message_id, channel_id, payload, attempts in rows:
+            now = time.monotonic()
+            ready_at = self._next_send.get(channel_id, 0)
+            if channel_id in blocked or ready_at > now:
+                # Keep per-channel order: nothing overtakes a held message
+                blocked.add(channel_id)
+                delay = ready_at - now
+                wait = delay if wait is None else min(wait, delay)
+                continue
+            self._next_send[channel_id] = now + self.per_channel_seconds
+            if channel_id in self._coalesce and attempts == 0:
+                if await self._drain_coalesced(channel_id,
+                                               self._coalesce[channel_id][1]):
+                    blocked.add(channel_id)
+                    processed += 1
+                    continue
+            await self._send(message_id, channel_id, payload, attempts)
+            processed += 1
+
+        if len(rows) == limit and processed:
+            return 0  # more may be due; go again right away
+
+        # Wake up again for the earliest retry still backing off
+        now = time.time()
+        row = await self.db.fetchone(
+            "SELECT MIN(next_attempt_at) FROM outbox WHERE next_attempt_at > ?",
+            (now, ))
+        if row[0] is not None:
+            delay = row[0] - now
+            wait = delay if wait is None else min(wait, delay)
+        return wait
+
+    async def _run(self):
+        await self.client.wait_until_ready()
+        while True:
+            self._wake.clear()
+            try:
+                wait = await self.drain()
+            except Exception as e:
+                print(f"Outbox drain error: {str(e)}")
+                wait = self.poll_seconds
+            if wait is None:
+                wait = self.poll_seconds
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def pending(self):
+        row = await self.db.fetchone("SELECT COUNT(*) FROM outbox")
+        return row[0]
+
+    def stats(self):
+        return {
+            'sent': self.sent,
+            'retried': self.retried,
+            'dropped': self.dropped,
+            'digests': self.digests,
+            'coalesced': self.coalesced,
+        }
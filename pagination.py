@@ -0,0 +1,51 @@
+class KeysetQuery:
+    """Newest-first pages over a table keyed by an integer id.
+
+    Pages are fetched with ``key < cursor`` (older) or ``key > cursor``
+    (newer) and ``LIMIT page_size + 1``, so every page is an index range
+    scan whatever its depth. ``filters`` maps column names to values;
+    None values are ignored.
+    """
+
+    def __init__(self, table, key, columns, filters=None, page_size=10):
+        self.table = table
+        self.key = key
+        self.columns = columns
+        self.filters = {
+            column: value
+            for column, value in (filters or {}).items() if value is not None
+        }
+        self.page_size = page_size
+
+    def _sql(self, cursor_op, order):
+        where = [f"{column} = ?" for column in self.filters]
+        if cursor_op:
+            where.append(f"{self.key} {cursor_op} ?")
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        return (f"SELECT {', '.join(self.columns)} FROM {self.table}{clause} "
+                f"ORDER BY {self.key} {order} LIMIT ?")
+
+    async def page(self, database, before=None, after=None):
+        """Fetch one page, newest first.
+
+        ``before`` pages towards older rows, ``after`` towards newer ones.
+        Returns ``(rows, has_older, has_newer)``; the key must be the first
+        column.
+        """
+        params = list(self.filters.values())
+        if after is not None:
+            rows = await database.fetchall(self._sql('>', 'ASC'),
+                                           params + [after, self.page_size + 1])
+            if len(rows) <= self.page_size:
+                # Reached the newest rows: show a full first page
+                return await self.page(database)
+            return rows[:self.page_size][::-1], True, True
+
+        if before is not None:
+            rows = await database.fetchall(self._sql('<', 'DESC'),
+                                           params + [before, self.page_size + 1])
+        else:
+            rows = await database.fetchall(self._sql(None, 'DESC'),
+                                           params + [self.page_size + 1])
+        has_older = len(rows) > self.page_size
+        return rows[:self.page_size], has_older, before is not None
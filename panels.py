@@ -0,0 +1,92 @@
+import hashlib
+import json
+
+import discord
+
+
+def content_hash(embed, view=None):
+    """Stable digest of what a panel message shows."""
+    payload = {
+        'embed': embed.to_dict() if embed else None,
+        'components': view.to_components() if view else [],
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class PanelRegistry:
+    """Remembers the message behind each channel panel.
+
+    ``panel_messages`` stores the channel, message id and content hash of
+    every posted panel. Publishing a panel whose hash is unchanged costs a
+    single message fetch; a changed panel is edited in place and only a
+    missing one is sent again. Panel views must be persistent (registered
+    with ``bot.add_view``) so their buttons survive restarts.
+    """
+
+    def __init__(self, database):
+        self.db = database
+
+    async def _save(self, key, channel_id, message_id, digest):
+        await self.db.execute(
+            """INSERT INTO panel_messages (panel, channel_id, message_id, content_hash)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(panel) DO UPDATE
+               SET channel_id = excluded.channel_id,
+                   message_id = excluded.message_id,
+                   content_hash = excluded.content_hash,
+                   updated_at = CURRENT_TIMESTAMP""",
+            (key, channel_id, message_id, digest))
+
+    async def _clear_legacy(self, channel, limit=100):
+        # Panels posted before the registry have dead, id-less buttons and
+        # would sit next to the new copy; remove the bot's old ones once
+        known = {row[0] for row in await self.db.fetchall(
+            "SELECT message_id FROM panel_messages WHERE channel_id = ?",
+            (channel.id, ))}
+        removed = 0
+        try:
+            async for message in channel.history(limit=limit):
+                if (message.author.id == channel.guild.me.id
+                        and message.components and message.id not in known):
+                    await message.delete()
+                    removed += 1
+        except discord.HTTPException as e:
+            print(f"Error cleaning old panels in {channel.id}: {str(e)}")
+        return removed
+
+    async def publish(self, key, channel, embed, view=None):
+        """Make sure panel ``key`` is showing in ``channel``.
+
+        Returns ``'unchanged'``, ``'edited'`` or ``'posted'``.
+        """
+        digest = content_hash(embed, view)
+        row = await self.db.fetchone(
+            "SELECT channel_id, message_id, content_hash FROM panel_messages WHERE panel = ?",
+            (key, ))
+
+        if row and row[0] == channel.id:
+            try:
+                if row[2] == digest:
+                    await channel.fetch_message(row[1])
+                    return 'unchanged'
+                await channel.get_partial_message(row[1]).edit(embed=embed,
+                                                               view=view)
+                await self._save(key, channel.id, row[1], digest)
+                return 'edited'
+            except discord.NotFound:
+                pass  # Deleted while we were away; post a new one
+        elif row is None:
+            await self._clear_legacy(channel)
+        else:
+            # Panel moved to another channel; drop the old message
+            old_channel = channel.guild.get_channel(row[0])
+            if old_channel:
+                try:
+                    await old_channel.get_partial_message(row[1]).delete()
+                except discord.HTTPException:
+                    pass
+
+        message = await channel.send(embed=embed, view=view)
+        await self._save(key, channel.id, message.id, digest)
+        return 'posted'
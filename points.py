@@ -0,0 +1,219 @@
+import asyncio
+
+# Ledger sources
+SOURCE_DAILY = 'daily'
+SOURCE_MESSAGE = 'message'
+SOURCE_REACTION = 'reaction'
+SOURCE_ADMIN_GIVE = 'admin_give'
+SOURCE_ADMIN_REMOVE = 'admin_remove'
+SOURCE_REDEMPTION = 'redemption'
+SOURCE_VENDOR_CLAIM = 'vendor_claim'
+SOURCE_WELCOME_BONUS = 'welcome_bonus'
+
+LEDGER_INSERT = """INSERT INTO points_ledger (user_id, delta, source, reference)
+                   VALUES (?, ?, ?, ?)"""
+
+
+def _apply_tier(c, tiers, user_id, points, old_tier):
+    # Returns the new tier if it changed, writing it in the same transaction
+    if tiers is None:
+        return None
+    new_tier = tiers.tier_for(points)
+    if new_tier == old_tier:
+        return None
+    c.execute("UPDATE rewards SET loyalty_tier = ? WHERE user_id = ?",
+              (new_tier, user_id))
+    return new_tier
+
+
+def _deduct(c, tiers, user_id, amount, source, username, reference, also):
+    row = c.execute(
+        """UPDATE rewards
+           SET points = points - ?, username = COALESCE(?, username)
+           WHERE user_id = ? AND points >= ?
+           RETURNING points, loyalty_tier""",
+        (amount, username, user_id, amount)).fetchone()
+    if not row:
+        return None, None, None
+    c.execute(LEDGER_INSERT, (user_id, -amount, source, reference))
+    if also is not None:
+        also(c)
+    return row[0], row[1], _apply_tier(c, tiers, user_id, row[0], row[1])
+
+
+def _grant(c, tiers, user_id, amount, source, username, reference,
+           last_daily):
+    balance, old_tier = c.execute(
+        """INSERT INTO rewards (user_id, points, username, last_daily)
+           VALUES (?, ?, ?, ?)
+           ON CONFLICT(user_id) DO UPDATE
+           SET points = points + excluded.points,
+               username = COALESCE(excluded.username, username),
+               last_daily = COALESCE(excluded.last_daily, last_daily)
+           RETURNING points, loyalty_tier""",
+        (user_id, amount, username, last_daily)).fetchone()
+    c.execute(LEDGER_INSERT, (user_id, amount, source, reference))
+    return balance, old_tier, _apply_tier(c, tiers, user_id, balance,
+                                          old_tier)
+
+
+def _grant_many(c, tiers, rows):
+    c.executemany(
+        """INSERT INTO rewards (user_id, points, username) VALUES (?, ?, ?)
+           ON CONFLICT(user_id) DO UPDATE
+           SET points = points + excluded.points""",
+        [(user_id, amount, username)
+         for user_id, amount, username, _ in rows])
+    c.executemany(LEDGER_INSERT,
+                  [(user_id, amount, source, None)
+                   for user_id, amount, _, source in rows])
+
+    # Post-update balances of the touched users, for tiers and the cache
+    balances = []
+    user_ids = list({row[0] for row in rows})
+    for i in range(0, len(user_ids), 500):
+        chunk = user_ids[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        balances += c.execute(
+            f"SELECT user_id, points, loyalty_tier FROM rewards WHERE user_id IN ({marks})",
+            chunk).fetchall()
+    if tiers is None:
+        return [], balances
+
+    changes = []
+    for i, (user_id, points, old_tier) in enumerate(balances):
+        new_tier = tiers.tier_for(points)
+        if new_tier != old_tier:
+            changes.append((user_id, old_tier, new_tier))
+            balances[i] = (user_id, points, new_tier)
+    c.executemany("UPDATE rewards SET loyalty_tier = ? WHERE user_id = ?",
+                  [(new_tier, user_id) for user_id, _, new_tier in changes])
+    return changes, balances
+
+
+def _enroll(c, tiers, user_id, amount, username, source, also):
+    c.execute(
+        """INSERT OR IGNORE INTO rewards (user_id, points, loyalty_tier, username)
+           VALUES (?, ?, 'Flirty Bronze', ?)""", (user_id, amount, username))
+    if not c.rowcount:
+        return False, None
+    c.execute(LEDGER_INSERT, (user_id, amount, source, None))
+    if also is not None:
+        also(c)
+    return True, _apply_tier(c, tiers, user_id, amount, 'Flirty Bronze')
+
+
+def _reconcile_chunk(conn, after_user_id, chunk_size):
+    return conn.execute(
+        """SELECT r.user_id, r.points,
+                  (SELECT COALESCE(SUM(l.delta), 0) FROM points_ledger l
+                   WHERE l.user_id = r.user_id)
+           FROM rewards r
+           WHERE r.user_id > ?
+           ORDER BY r.user_id
+           LIMIT ?""", (after_user_id, chunk_size)).fetchall()
+
+
+class PointsEngine:
+    """Single-statement point changes backed by an append-only ledger.
+
+    ``rewards.points`` is a materialized balance. Every change is one
+    conditional UPDATE/UPSERT with ``RETURNING`` plus its ``points_ledger``
+    row, queued as a single write operation so the bookkeeping adds no
+    round trips. Two concurrent redemptions can never spend the same
+    points twice.
+
+    When a :class:`loyalty.TierTable` is given, the tier is re-evaluated in
+    the same operation and written only if it changed; promotions are
+    reported to ``on_promotion(user_id, old_tier, new_tier)``.
+    """
+
+    def __init__(self, database, cache=None, tiers=None, on_promotion=None):
+        self.db = database
+        self.cache = cache
+        self.tiers = tiers
+        self.on_promotion = on_promotion
+
+    def _changed(self, user_id):
+        if self.cache is not None:
+            self.cache.invalidate(user_id)
+
+    def _tier_changed(self, user_id, old_tier, new_tier):
+        if (new_tier is not None and self.on_promotion is not None
+                and self.tiers.is_promotion(old_tier, new_tier)):
+            self.on_promotion(user_id, old_tier, new_tier)
+
+    async def deduct(self, user_id, amount, source, username=None,
+                     reference=None, also=None):
+        """Remove ``amount`` points if the balance covers it.
+
+        Returns the new balance, or None when the user has no rewards row
+        or not enough points (nothing is changed in that case). ``also``,
+        if given, is called with the cursor in the same transaction when
+        the deduction goes through.
+        """
+        balance, old_tier, new_tier = await self.db.transaction(
+            _deduct, self.tiers, user_id, amount, source, username,
+            reference, also)
+        if balance is not None:
+            self._changed(user_id)
+            self._tier_changed(user_id, old_tier, new_tier)
+        return balance
+
+    async def grant(self, user_id, amount, source, username=None,
+                    reference=None, last_daily=None):
+        """Add ``amount`` points, creating the rewards row if needed.
+
+        Returns the new balance.
+        """
+        balance, old_tier, new_tier = await self.db.transaction(
+            _grant, self.tiers, user_id, amount, source, username, reference,
+            last_daily)
+        self._changed(user_id)
+        self._tier_changed(user_id, old_tier, new_tier)
+        return balance
+
+    async def grant_many(self, rows):
+        """Apply ``(user_id, amount, username, source)`` rows in one batch."""
+        changes, balances = await self.db.transaction(_grant_many, self.tiers,
+                                                      rows)
+        if self.cache is not None:
+            for user_id, points, tier in balances:
+                self.cache.update(user_id, (points, tier))
+        for user_id, old_tier, new_tier in changes:
+            self._changed(user_id)
+            self._tier_changed(user_id, old_tier, new_tier)
+
+    async def enroll(self, user_id, amount, username,
+                     source=SOURCE_WELCOME_BONUS, also=None):
+        """Create a rewards row with a starting bonus.
+
+        Returns False (and changes nothing) if the user already has one.
+        ``also`` is called with the cursor in the same transaction when the
+        row is created.
+        """
+        created, new_tier = await self.db.transaction(
+            _enroll, self.tiers, user_id, amount, username, source, also)
+        if created:
+            self._changed(user_id)
+            self._tier_changed(user_id, 'Flirty Bronze', new_tier)
+        return created
+
+    async def reconcile(self, chunk_size=500):
+        """Compare every balance with its ledger sum, one chunk at a time.
+
+        Runs on the reader threads and yields between chunks so it never
+        holds a lock for long. Returns ``(user_id, balance, ledger_sum)``
+        for each mismatch.
+        """
+        mismatches = []
+        last_user_id = -1
+        while True:
+            rows = await self.db.read(_reconcile_chunk, last_user_id,
+                                      chunk_size)
+            if not rows:
+                break
+            mismatches.extend(row for row in rows if row[1] != row[2])
+            last_user_id = rows[-1][0]
+            await asyncio.sleep(0)
+        return mismatches
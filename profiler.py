@@ -0,0 +1,125 @@
+import re
+import sqlite3
+import threading
+import time
+
+# Runs of placeholders in IN (...) lists share one entry
+_PLACEHOLDERS = re.compile(r'\?(?:\s*,\s*\?)+')
+_EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+
+class _Statement:
+    __slots__ = ('sql', 'calls', 'total', 'max', 'slow', 'plan')
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow = 0
+        self.plan = None
+
+
+class QueryProfiler:
+    """Per-statement counts and timings for every SQLite execute.
+
+    Off by default; when off the cursor hook costs one attribute check.
+    Statements slower than ``slow_ms`` are logged, and the first slow
+    call of each distinct statement captures its ``EXPLAIN QUERY PLAN``.
+    Timings cover ``execute`` (for a SELECT, up to its first row).
+    """
+
+    def __init__(self, slow_ms=50):
+        self.enabled = False
+        self.slow_ms = slow_ms
+        self._statements = {}
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def _key(self, sql):
+        key = self._keys.get(sql)
+        if key is None:
+            key = _PLACEHOLDERS.sub('?, …', ' '.join(sql.split()))
+            self._keys[sql] = key
+        return key
+
+    def record(self, conn, sql, params, seconds):
+        key = self._key(sql)
+        explain = False
+        with self._lock:
+            stmt = self._statements.get(key)
+            if stmt is None:
+                stmt = self._statements[key] = _Statement(key)
+            stmt.calls += 1
+            stmt.total += seconds
+            stmt.max = max(stmt.max, seconds)
+            if seconds * 1000 < self.slow_ms:
+                return
+            stmt.slow += 1
+            if stmt.plan is None and params is not None and key.upper(
+            ).startswith(_EXPLAINABLE):
+                stmt.plan = ''  # claimed; captured below
+                explain = True
+
+        if explain:
+            stmt.plan = self._explain(conn, sql, params)
+        print(f"🐢 Slow query ({seconds * 1000:.1f} ms): {key}"
+              + (f"\n{stmt.plan}" if explain else ""))
+
+    def _explain(self, conn, sql, params):
+        try:
+            rows = sqlite3.Cursor(conn).execute(f"EXPLAIN QUERY PLAN {sql}",
+                                                params).fetchall()
+            return "\n".join(row[-1] for row in rows)
+        except sqlite3.Error as e:
+            return f"(no plan: {e})"
+
+    def top(self, count=10, by='total'):
+        """The ``count`` heaviest statements by ``total``, ``max`` or ``calls``."""
+        with self._lock:
+            statements = list(self._statements.values())
+        return sorted(statements, key=lambda s: getattr(s, by),
+                      reverse=True)[:count]
+
+    def reset(self):
+        with self._lock:
+            self._statements = {}
+
+
+profiler = QueryProfiler()
+
+
+class ProfilingCursor(sqlite3.Cursor):
+
+    def execute(self, sql, parameters=()):
+        if not profiler.enabled:
+            return super().execute(sql, parameters)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            profiler.record(self.connection, sql, parameters,
+                            time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not profiler.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            profiler.record(self.connection, sql, None,
+                            time.perf_counter() - started)
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """Connection whose cursors report to :data:`profiler`."""
+
+    def cursor(self, factory=ProfilingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
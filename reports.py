@@ -0,0 +1,21 @@
+from collections import namedtuple
+
+DailyTotals = namedtuple(
+    'DailyTotals',
+    ['days', 'orders', 'items', 'points_issued', 'points_redeemed',
+     'new_members'])
+
+
+async def daily_totals(database, start, end):
+    """Sum the ``daily_stats`` rollups for ``start``..``end`` (inclusive).
+
+    Dates are ``YYYY-MM-DD`` strings (UTC days). Reads one primary-key
+    range of the rollup table, never the underlying events.
+    """
+    row = await database.fetchone(
+        """SELECT COUNT(*), COALESCE(SUM(orders), 0), COALESCE(SUM(items), 0),
+                  COALESCE(SUM(points_issued), 0),
+                  COALESCE(SUM(points_redeemed), 0),
+                  COALESCE(SUM(new_members), 0)
+           FROM daily_stats WHERE day BETWEEN ? AND ?""", (start, end))
+    return DailyTotals(*row)
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+
+# Marker for users that have no rewards row yet
+_MISSING = object()
+
+
+class RewardCache:
+    """Size-bounded LRU cache of ``(points, loyalty_tier)`` by user_id.
+
+    Reads fall through to the database on a miss. Every code path that
+    changes a user's points must call :meth:`invalidate` (or
+    :meth:`update`) afterwards so the next read sees the new balance.
+    """
+
+    def __init__(self, database, maxsize=10000):
+        self.db = database
+        self.maxsize = maxsize
+        self._rows = OrderedDict()
+        # Bumped on every change so reads started before a write never
+        # store a stale row afterwards
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    async def get(self, user_id):
+        """Return ``(points, loyalty_tier)`` for a user, or None."""
+        row = self._rows.get(user_id)
+        if row is not None:
+            self._rows.move_to_end(user_id)
+            self.hits += 1
+            return None if row is _MISSING else row
+
+        self.misses += 1
+        epoch = self._epoch
+        row = await self.db.fetchone(
+            "SELECT points, loyalty_tier FROM rewards WHERE user_id = ?",
+            (user_id, ))
+        if epoch == self._epoch:
+            self._store(user_id, tuple(row) if row else _MISSING)
+        return tuple(row) if row else None
+
+    def _store(self, user_id, row):
+        self._rows[user_id] = row
+        self._rows.move_to_end(user_id)
+        while len(self._rows) > self.maxsize:
+            self._rows.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id):
+        """Drop a user's cached row after their points changed."""
+        self._epoch += 1
+        self._rows.pop(user_id, None)
+
+    def update(self, user_id, row):
+        """Replace a cached row with the committed ``(points, loyalty_tier)``.
+
+        Only users already cached are stored, so batch writes don't churn
+        the LRU order.
+        """
+        self._epoch += 1
+        if user_id in self._rows:
+            self._rows[user_id] = row
+
+    def stats(self):
+        """Hit/miss counters for monitoring."""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._rows),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+PROCESS_STARTED = time.monotonic()
+
+
+class Startup:
+    """Runs the startup steps once per process.
+
+    Steps are independent coroutines run concurrently, with at most
+    ``concurrency`` in flight so a burst of panel edits never floods one
+    rate-limit bucket. Each step's duration (or error) is recorded, and
+    :attr:`ready_seconds` is the time from process start until the last
+    step finished.
+    """
+
+    def __init__(self, concurrency=3):
+        self.concurrency = concurrency
+        self.timings = {}
+        self.errors = {}
+        self.ready_seconds = None
+        self._steps = []
+        self._started = False
+
+    @property
+    def started(self):
+        return self._started
+
+    def step(self, name, fn, *args):
+        """Register ``fn(*args)`` to run as step ``name``."""
+        self._steps.append((name, fn, args))
+
+    async def _run_step(self, semaphore, name, fn, args):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await fn(*args)
+            except Exception as e:
+                self.errors[name] = str(e)
+                print(f"❌ Startup step {name} failed: {e}")
+            finally:
+                self.timings[name] = time.perf_counter() - started
+
+    async def run(self):
+        """Run every registered step. Returns False if already run."""
+        if self._started:
+            return False
+        self._started = True
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._run_step(semaphore, name, fn, args)
+                               for name, fn, args in self._steps))
+        self.ready_seconds = time.monotonic() - PROCESS_STARTED
+        return True
+
+    def slowest(self, count=3):
+        """The ``count`` slowest steps as ``(name, seconds)``."""
+        return sorted(self.timings.items(), key=lambda item: item[1],
+                      reverse=True)[:count]
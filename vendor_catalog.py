@@ -0,0 +1,83 @@
+import asyncio
+from collections import namedtuple
+
+VendorReward = namedtuple(
+    'VendorReward',
+    ['reward_id', 'vendor_id', 'vendor_username', 'reward_name',
+     'points_cost', 'description'])
+
+
+class VendorCatalog:
+    """In-memory copy of ``vendor_rewards`` with a generation counter.
+
+    The table is loaded once; after that browsing is served from memory.
+    Adding or removing a reward goes through this class, which writes to
+    the database and bumps :attr:`generation` so anything rendered from
+    an older generation is rebuilt.
+    """
+
+    def __init__(self, database):
+        self.db = database
+        self.generation = 0
+        self._rewards = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._rendered = None
+        self._rendered_generation = -1
+
+    async def load(self):
+        """Load every reward from the database if not already loaded."""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            rows = await self.db.fetchall(
+                "SELECT reward_id, vendor_id, vendor_username, reward_name, "
+                "points_cost, description FROM vendor_rewards "
+                "ORDER BY reward_id")
+            self._rewards = {row[0]: VendorReward(*row) for row in rows}
+            self._loaded = True
+            self.generation += 1
+
+    async def rewards(self):
+        """All rewards, ordered by id."""
+        await self.load()
+        return list(self._rewards.values())
+
+    async def get(self, reward_id):
+        """A single reward, or None if it no longer exists."""
+        await self.load()
+        return self._rewards.get(reward_id)
+
+    async def add(self, vendor_id, vendor_username, reward_name, points_cost,
+                  description):
+        """Insert a reward and return it."""
+        await self.load()
+        result = await self.db.execute(
+            "INSERT INTO vendor_rewards (vendor_id, vendor_username, reward_name, points_cost, description) VALUES (?, ?, ?, ?, ?)",
+            (vendor_id, vendor_username, reward_name, points_cost,
+             description))
+        reward = VendorReward(result.lastrowid, vendor_id, vendor_username,
+                              reward_name, points_cost, description)
+        self._rewards[reward.reward_id] = reward
+        self.generation += 1
+        return reward
+
+    async def remove(self, reward_id):
+        """Delete a reward. Returns True if it existed."""
+        await self.load()
+        result = await self.db.execute(
+            "DELETE FROM vendor_rewards WHERE reward_id = ?", (reward_id, ))
+        existed = self._rewards.pop(reward_id, None) is not None
+        if existed or result.rowcount:
+            self.generation += 1
+        return existed
+
+    async def rendered(self, render):
+        """Return ``render(rewards)``, cached for the current generation."""
+        await self.load()
+        if self._rendered_generation != self.generation:
+            self._rendered = render(list(self._rewards.values()))
+            self._rendered_generation = self.generation
+        return self._rendered
@@ -0,0 +1,91 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+
+class LoopWatchdog:
+    """Measures event loop lag and captures the stack of long stalls.
+
+    A heartbeat task sleeps ``interval`` seconds and records how late it
+    woke up. A helper thread checks the heartbeat; when it is more than
+    ``threshold`` seconds overdue, the loop is blocked, so it grabs the
+    loop thread's current stack (once per stall) and keeps the last
+    ``keep`` captures.
+    """
+
+    def __init__(self, interval=0.1, threshold=0.25, samples=1000, keep=10):
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls = deque(maxlen=keep)
+        self._lags = deque(maxlen=samples)
+        self._beat = time.monotonic()
+        self._loop_thread = None
+        self._task = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start monitoring the running loop (call from inside it)."""
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        threading.Thread(target=self._watch, name='loop-watchdog',
+                         daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _heartbeat(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self._beat = now = time.monotonic()
+            self._lags.append(max(now - started - self.interval, 0.0))
+
+    def _watch(self):
+        captured_for = None
+        while not self._stop.wait(self.interval / 2):
+            beat = self._beat
+            overdue = time.monotonic() - beat - self.interval
+            if overdue < self.threshold or captured_for == beat:
+                continue
+            captured_for = beat
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            self.stalls.append({
+                'at': time.time(),
+                'lag_seconds': round(overdue, 3),
+                'stack': stack,
+            })
+            print(f"⚠️ Event loop blocked for {overdue * 1000:.0f} ms:\n{stack}")
+
+    def percentiles(self):
+        """Lag p50/p90/p99/max in milliseconds over the recent samples."""
+        lags = sorted(self._lags)
+        if not lags:
+            return {'samples': 0}
+
+        def pick(q):
+            return round(lags[min(int(q * len(lags)), len(lags) - 1)] * 1000,
+                         2)
+
+        return {
+            'samples': len(lags),
+            'p50_ms': pick(0.50),
+            'p90_ms': pick(0.90),
+            'p99_ms': pick(0.99),
+            'max_ms': round(lags[-1] * 1000, 2),
+        }
+
+
+watchdog = LoopWatchdog()